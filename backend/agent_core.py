@@ -3,10 +3,15 @@ from dotenv import load_dotenv
 from crewai import Agent, Task, Crew, Process, LLM
 from tools import academic_search_tool, dynamic_web_scraper_tool, google_scholar_tool, cv_generator_tool, ui_scholar_search_tool, pdf_search_tool, url_search_tool, eng_ui_personnel_scraper_tool
 import re
+import hashlib
+import threading
+import log_setup
 from collections import OrderedDict
 
 load_dotenv()
 
+logger = log_setup.configure("agent_core")
+
 # Global variable to store current session_id for PDF search
 _current_session_id = None
 
@@ -14,7 +19,7 @@ def set_session_context(session_id: str):
     """Set the current session ID for PDF search context."""
     global _current_session_id
     _current_session_id = session_id
-    print(f"[SESSION_CONTEXT] Set session_id: {session_id}")
+    logger.debug("[SESSION_CONTEXT] Set session_id: %s", session_id)
 
 def get_session_context() -> str:
     """Get the current session ID."""
@@ -29,6 +34,15 @@ class HybridRAG:
     - CV Generation → Special handling with CV tool
     """
     
+    # Max number of scraped URL bodies kept in the per-instance memo
+    URL_CACHE_SIZE = 64
+    
+    # dynamic_web_scraper_tool reports failures as text instead of raising; these are never memoized
+    _SCRAPE_ERROR_MARKERS = (
+        "=== Failed to scrape", "=== TIMEOUT Error", "=== HTTP Error", "=== Unexpected error",
+        "No content could be scraped", "No valid URLs provided",
+    )
+    
     def __init__(self):
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
@@ -40,6 +54,11 @@ class HybridRAG:
             temperature=0.2,
             max_tokens=8000,  # Increased from 2000 to handle larger contexts
         )
+        
+        # url -> (body_hash, body), oldest first; the instance is shared by concurrent
+        # requests (get_rag()), so every access goes through the lock
+        self._url_cache = OrderedDict()
+        self._url_cache_lock = threading.Lock()
     
     def query(self, user_query: str, user_urls: list = None, conversation_history: list = None, session_id: str = None) -> str:
         """
@@ -59,17 +78,17 @@ class HybridRAG:
             if session_id:
                 set_session_context(session_id)
             
-            print("\n" + "=" * 70)
-            print("🚀 HYBRID RAG QUERY PROCESSING")
-            print("=" * 70)
-            print(f"📝 Query: {user_query}")
+            logger.debug("=" * 70)
+            logger.debug("🚀 HYBRID RAG QUERY PROCESSING")
+            logger.debug("=" * 70)
+            logger.debug("📝 Query: %s", user_query)
             if session_id:
-                print(f"🔑 Session ID: {session_id}")
+                logger.debug("🔑 Session ID: %s", session_id)
             
             # NEW: Resolve pronouns using conversation history
             if conversation_history:
                 resolved_query = self._resolve_pronouns_in_query(user_query, conversation_history)
-                print(f"🔍 Resolved Query: {resolved_query}")
+                logger.debug("🔍 Resolved Query: %s", resolved_query)
                 # Use resolved query for processing
                 processing_query = resolved_query
             else:
@@ -79,17 +98,17 @@ class HybridRAG:
             conversation_context = self._format_conversation_history(conversation_history) if conversation_history else ""
             
             # STEP 1: Vector Search (Astra DB)
-            print("\n[STEP 1/4] 🔎 Vector Search (Astra DB)...")
+            logger.debug("[STEP 1/4] 🔎 Vector Search (Astra DB)...")
             vector_results = self._vector_search(processing_query)
             
             # STEP 2: Conditional Web Scraping
-            print("\n[STEP 2/4] 🌐 Web Scraping...")
+            logger.debug("[STEP 2/4] 🌐 Web Scraping...")
             scraped_data = ""
             if user_urls:
                 scraped_data = self._scrape_urls(user_urls)
             
             # STEP 3: Construct Context for Agents
-            print("\n[STEP 3/4] 📦 Building Context...")
+            logger.debug("[STEP 3/4] 📦 Building Context...")
             context = self._build_context(
                 vector_results=vector_results,
                 scraped_data=scraped_data,
@@ -97,7 +116,7 @@ class HybridRAG:
             )
             
             # STEP 4: Run CrewAI Agents
-            print("\n[STEP 4/4] 🤖 Running AI Agents...")
+            logger.debug("[STEP 4/4] 🤖 Running AI Agents...")
             final_output = self._run_crew(
                 query=processing_query,  # Use resolved query
                 original_query=user_query,  # Keep original for reference
@@ -106,20 +125,18 @@ class HybridRAG:
             )
             
             # Post-processing
-            print("\n[POST-PROCESSING] 🧹 Cleaning output...")
+            logger.debug("[POST-PROCESSING] 🧹 Cleaning output...")
             final_output = self._filter_personal_info(final_output)
             final_output = self._safety_check(final_output)
             
-            print("\n" + "=" * 70)
-            print("✅ QUERY PROCESSING COMPLETE")
-            print("=" * 70)
+            logger.debug("=" * 70)
+            logger.debug("✅ QUERY PROCESSING COMPLETE")
+            logger.debug("=" * 70)
             
             return final_output
             
         except Exception as e:
-            print(f"\n❌ ERROR in query processing: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ ERROR in query processing: %s", e)
             return self._emergency_fallback(user_query)
     
     def _format_conversation_history(self, history: list) -> str:
@@ -199,13 +216,13 @@ class HybridRAG:
                         extracted_names.append(name)
         
         if not extracted_names:
-            print("[CONTEXT] No names found in history, keeping query as-is")
+            logger.debug("[CONTEXT] No names found in history, keeping query as-is")
             return query
         
         # Use the most recent name found
         target_name = extracted_names[0]
         
-        print(f"[CONTEXT] Detected pronoun reference to: '{target_name}'")
+        logger.debug("[CONTEXT] Detected pronoun reference to: '%s'", target_name)
         
         # Replace pronouns with the actual name
         # Strategy: Intelligently inject the name into the query
@@ -265,12 +282,12 @@ Please specify the professor name clearly, for example:
 Then I'll gather all available information and prepare the CV for download."""
         
         # Use CV Generator Tool
-        print(f"[CV_HANDLER] Generating CV for: {name}")
+        logger.debug("[CV_HANDLER] Generating CV for: %s", name)
         try:
             result = cv_generator_tool._run(name)
             return result
         except Exception as e:
-            print(f"[CV_HANDLER ERROR] {e}")
+            logger.warning("[CV_HANDLER ERROR] %s", e)
             return f"❌ Error generating CV: {str(e)}"
     
     def _deduplicate_names_gentle(self, text: str) -> str:
@@ -319,7 +336,7 @@ Then I'll gather all available information and prepare the CV for download."""
     
     def _crewai_complex_query(self, query: str, user_urls: list = None, history_context: str = "") -> str:
         """Use CrewAI for complex queries that need multi-step reasoning."""
-        print("\n[CREWAI MODE] Initializing agent...")
+        logger.debug("[CREWAI MODE] Initializing agent...")
         
         try:
             agent = Agent(
@@ -408,7 +425,7 @@ Answer concisely with ONLY academic and professional information:""",
             return output
             
         except Exception as e:
-            print(f"[ERROR] CrewAI failed: {e}")
+            logger.warning("[ERROR] CrewAI failed: %s", e)
             return self._emergency_fallback(query)
     
     def _filter_personal_info(self, text: str) -> str:
@@ -419,7 +436,7 @@ Answer concisely with ONLY academic and professional information:""",
         Personal Info = Family (spouse, children, parents, siblings)
         NOT Personal Info = Professional roles (Professor, Chairperson, Director, etc.)
         """
-        print("[FILTER] Checking for personal FAMILY information...")
+        logger.debug("[FILTER] Checking for personal FAMILY information...")
         
         # VERY STRICT: Only FAMILY-related keywords
         # These patterns require CONTEXT to avoid false positives
@@ -467,18 +484,18 @@ Answer concisely with ONLY academic and professional information:""",
             
             # ONLY filter if it's family info AND NOT professional role
             if is_family_info and not has_professional_keyword:
-                print(f"  [REMOVED] Family info: {line[:80]}...")
+                logger.debug("  [REMOVED] Family info: %s...", line[:80])
             else:
                 filtered_lines.append(line)
         
         result = '\n'.join(filtered_lines)
-        print(f"  ✓ Personal info filter complete")
+        logger.debug("  ✓ Personal info filter complete")
         return result
     
     def _safety_check(self, output: str) -> str:
         """Final safety checks and formatting."""
         if len(output) > 8000:
-            print("  ⚠️ Output too long, truncating...")
+            logger.warning("  ⚠️ Output too long, truncating...")
             output = output[:8000] + "\n\n[Output truncated for safety]"
         
         # Remove excessive repetition (same sentence appearing 3+ times)
@@ -519,30 +536,67 @@ Please try again with a more specific question!"""
         try:
             from tools import academic_search_tool
             result = academic_search_tool._run(query)
-            print(f"  ✓ Vector search returned {len(result)} characters")
+            logger.debug("  ✓ Vector search returned %d characters", len(result))
             return result
         except Exception as e:
-            print(f"  ✗ Vector search failed: {e}")
+            logger.warning("  ✗ Vector search failed: %s", e)
             return ""
     
+    def _is_valid_data(self, content: str) -> bool:
+        """True if a scraper result is page content rather than one of the tool's error/timeout texts."""
+        return bool(content and content.strip()) and not any(
+            marker in content for marker in self._SCRAPE_ERROR_MARKERS
+        )
+    
     def _scrape_urls(self, urls: list) -> str:
-        """Scrape content from provided URLs."""
+        """
+        Scrape content from provided URLs.
+        
+        URLs are deduplicated (order preserved) and served from an LRU memo of
+        previously scraped pages, so a link the user repeats every turn is only
+        fetched once. Pages with identical bodies are only included once.
+        """
         try:
             from tools import dynamic_web_scraper_tool
             scraped_content = []
-            for url in urls:
+            seen_hashes = set()
+            for url in dict.fromkeys(urls):
                 try:
-                    content = dynamic_web_scraper_tool._run(url)
+                    with self._url_cache_lock:
+                        cached = self._url_cache.get(url)
+                        if cached:
+                            self._url_cache.move_to_end(url)
+                    
+                    if cached:
+                        body_hash, content = cached
+                        logger.info("  ✓ Cached %s", url)
+                    else:
+                        # Scraped outside the lock so other requests aren't blocked on the network
+                        content = dynamic_web_scraper_tool._run(url)
+                        body_hash = hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+                        if self._is_valid_data(content):
+                            with self._url_cache_lock:
+                                self._url_cache[url] = (body_hash, content)
+                                self._url_cache.move_to_end(url)
+                                if len(self._url_cache) > self.URL_CACHE_SIZE:
+                                    self._url_cache.popitem(last=False)
+                            logger.info("  ✓ Scraped %s", url)
+                        else:
+                            # Passed on for this turn, but scraped again next time
+                            logger.warning("  ✗ Scrape of %s failed (not cached)", url)
+                    
+                    if body_hash in seen_hashes:
+                        continue
+                    seen_hashes.add(body_hash)
                     scraped_content.append(f"From {url}:\n{content}\n")
-                    print(f"  ✓ Scraped {url}")
                 except Exception as e:
-                    print(f"  ✗ Failed to scrape {url}: {e}")
+                    logger.warning("  ✗ Failed to scrape %s: %s", url, e)
             
             result = "\n".join(scraped_content)
-            print(f"  ✓ Scraped {len(urls)} URLs, {len(result)} characters total")
+            logger.info("  ✓ Scraped %d URLs, %d characters total", len(urls), len(result))
             return result
         except Exception as e:
-            print(f"  ✗ URL scraping failed: {e}")
+            logger.warning("  ✗ URL scraping failed: %s", e)
             return ""
     
     def _build_context(self, vector_results: str, scraped_data: str, conversation_context: str) -> str:
@@ -559,7 +613,7 @@ Please try again with a more specific question!"""
             context_parts.append(f"=== SCRAPED WEB DATA ===\n{scraped_data}\n")
         
         context = "\n".join(context_parts)
-        print(f"  ✓ Built context: {len(context)} characters")
+        logger.debug("  ✓ Built context: %d characters", len(context))
         return context
     
     def _run_crew(self, query: str, original_query: str, context: str, conversation_history: list = None) -> str:
@@ -784,13 +838,11 @@ Answer concisely with ONLY academic and professional information:"""
             # Only keep the Final Answer section
             output = self._extract_final_answer_only(output)
             
-            print(f"  ✓ CrewAI completed, output: {len(output)} characters")
+            logger.debug("  ✓ CrewAI completed, output: %d characters", len(output))
             return output
             
         except Exception as e:
-            print(f"  ✗ CrewAI execution failed: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("  ✗ CrewAI execution failed: %s", e)
             return self._emergency_fallback(query)
     
     def _clean_context_for_publications(self, context: str) -> str:
@@ -840,7 +892,7 @@ Answer concisely with ONLY academic and professional information:"""
         
         We only want the "Final Answer" part!
         """
-        print("[FORMATTING] Extracting Final Answer only...")
+        logger.debug("[FORMATTING] Extracting Final Answer only...")
         
         # Strategy 1: Look for "Final Answer" marker (most reliable)
         if "Final Answer" in crewai_output or "final answer" in crewai_output.lower():
@@ -848,7 +900,7 @@ Answer concisely with ONLY academic and professional information:"""
             parts = re.split(r'(?i)final\s+answer[:\s]*', crewai_output)
             if len(parts) > 1:
                 final_answer = parts[-1].strip()
-                print(f"  ✓ Extracted Final Answer ({len(final_answer)} chars)")
+                logger.debug("  ✓ Extracted Final Answer (%d chars)", len(final_answer))
                 return final_answer
         
         # Strategy 2: Remove common thinking markers
@@ -885,11 +937,11 @@ Answer concisely with ONLY academic and professional information:"""
         
         if answer_lines:
             result = '\n'.join(answer_lines).strip()
-            print(f"  ✓ Cleaned output ({len(result)} chars)")
+            logger.debug("  ✓ Cleaned output (%d chars)", len(result))
             return result
         
         # Fallback: Return cleaned version
-        print(f"  ⚠️ Could not find clear Final Answer marker, returning cleaned version")
+        logger.warning("  ⚠️ Could not find clear Final Answer marker, returning cleaned version")
         return cleaned.strip()
 
 # Singleton
@@ -914,5 +966,6 @@ def run_agentic_rag_crew(user_query: str, user_urls: list = None, conversation_h
     Returns:
         AI-generated response
     """
-    hybrid_rag = HybridRAG()
+    # Reuse the singleton so the scraped-URL memo survives across turns
+    hybrid_rag = get_rag()
     return hybrid_rag.query(user_query, user_urls, conversation_history, session_id)
@@ -5,9 +5,15 @@ from tools import academic_search_tool, dynamic_web_scraper_tool, google_scholar
 import re
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 import numpy as np
+import logging
+import log_setup
 
 load_dotenv()
 
+__all__ = ["SimpleRAG", "get_simple_rag", "run_simple_rag"]
+
+logger = log_setup.configure("simple_rag")
+
 class SimpleRAG:
     """
     SIMPLIFIED RAG System with 3-tier routing:
@@ -26,17 +32,89 @@ class SimpleRAG:
     - Publications analysis
     """
     
+    # ⚡ Output-token budget per response intent (LLM.call does not forward max_tokens)
+    # Gemini 2.5 Pro counts thinking tokens against this cap, so each budget is the
+    # expected answer plus a few hundred tokens of thinking headroom.
+    _MAX_TOKENS = {
+        'list': 1500,     # Unchanged: the full department list is ~60 names × ~15 tokens with titles
+        'lookup': 1024,   # Person/publication answers: max 300 words ≈ 400 tokens
+        'summary': 1200,  # PDF/URL summaries: max 400 words ≈ 550 tokens
+    }
+    
+    # Capitalized words that start questions rather than name a person (_is_db_sufficient)
+    _QUERY_WORDS = {
+        'tell', 'what', 'where', 'when', 'which', 'show', 'give', 'find', 'about',
+        'siapa', 'jelaskan', 'tentang', 'berikan', 'tolong', 'cari', 'please',
+    }
+    
+    # Static prompt blocks, built once per class instead of per request.
+    # Only the query and retrieved data are interpolated at call time, so the
+    # prompt prefix/suffix stays byte-identical across calls.
+    _LIST_HEADER = "Extract and list ALL lecturer names from the database information below."
+    _LIST_INSTRUCTIONS = """CRITICAL INSTRUCTIONS:
+1. Extract COMPLETE names only (e.g., "Dr. Abdul Muis., ST., M.Eng.")
+2. Skip INCOMPLETE names (e.g., "F. Astha" without full name)
+3. Remove EXACT duplicates (e.g., if "Tomy Abuzairi" and "Abuzairi" both appear, keep only the longer one)
+4. Format as a clean numbered list
+5. Group by academic title: Professors (Prof.) first, then Doctors (Dr.), then Lecturers
+6. DO NOT add position or research areas - NAMES ONLY
+7. DO NOT include partial names, truncated names, or incomplete entries
+
+Output format:
+## Professors
+1. [Full name with all titles and degrees]
+2. [Full name with all titles and degrees]
+
+## Doctors & Senior Lecturers
+1. [Full name with all titles and degrees]
+
+## Lecturers
+1. [Full name with all titles and degrees]
+
+Extract names now:"""
+    
+    _LOOKUP_HEADER = "You are an academic assistant. Answer this query based ONLY on the provided database information."
+    _LOOKUP_INSTRUCTIONS = """Instructions:
+1. Answer concisely (max 300 words)
+2. Use ONLY information from the database above
+3. Format nicely with markdown
+4. Include: name, position, research areas (if available)
+5. DO NOT make up information
+6. DO NOT include personal details (birth date, family, etc.)
+
+Answer:"""
+    
+    _SUMMARY_HEADERS = {
+        "PDF": "Ringkas dan jelaskan isi PDF berikut dalam bahasa Indonesia yang mudah dipahami.",
+        "website": "Ringkas dan jelaskan isi website/URL berikut dalam bahasa Indonesia yang mudah dipahami.",
+    }
+    _SUMMARY_INSTRUCTIONS = {
+        source: f"""INSTRUKSI:
+1. Gunakan format markdown yang rapi (## untuk header, - untuk bullet points)
+2. Buat ringkasan yang jelas dan terstruktur
+3. Jangan tambahkan informasi yang tidak ada di {source}
+4. Maksimal 400 kata
+
+Ringkasan:"""
+        for source in ("PDF", "website")
+    }
+    
     def __init__(self):
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             raise ValueError("GEMINI_API_KEY not found")
         
-        self.llm = LLM(
-            model="gemini/gemini-2.5-pro",
-            api_key=api_key,
-            temperature=0.0,  # ⚡ 0.0 for fastest, most deterministic output
-            max_tokens=1500,  # ⚡ Reduced for faster generation
-        )
+        # One LLM per response intent, built up front: the instance is shared by
+        # concurrent requests, so nothing is created or cached on first use
+        self._intent_llms = {
+            intent: LLM(
+                model="gemini/gemini-2.5-pro",
+                api_key=api_key,
+                temperature=0.0,  # ⚡ 0.0 for fastest, most deterministic output
+                max_tokens=max_tokens,
+            )
+            for intent, max_tokens in self._MAX_TOKENS.items()
+        }
         
         # Initialize embedding model for semantic similarity
         self.embeddings = GoogleGenerativeAIEmbeddings(
@@ -53,59 +131,57 @@ class SimpleRAG:
         Smart routing based on query complexity with PERFORMANCE OPTIMIZATION.
         """
         try:
-            print("\n" + "=" * 70)
-            print("🚀 SIMPLIFIED RAG QUERY PROCESSING")
-            print("=" * 70)
-            print(f"📝 Query: {user_query}")
+            logger.debug("=" * 70)
+            logger.debug("🚀 SIMPLIFIED RAG QUERY PROCESSING")
+            logger.debug("=" * 70)
+            logger.debug("📝 Query: %s", user_query)
             
             # STEP 1: Vector Search (always do this first)
-            print("\n[STEP 1] 🔎 Vector Search...")
+            logger.debug("[STEP 1] 🔎 Vector Search...")
             vector_results = self._vector_search(user_query)
             
             # STEP 2: Smart routing based on query AND database richness
             query_type = self._detect_query_type(user_query, vector_results)
-            print(f"\n[STEP 2] 🎯 Query Type: {query_type}")
+            logger.debug("[STEP 2] 🎯 Query Type: %s", query_type)
             
             if query_type == "PDF_QUERY":
                 # TIER 0: Direct PDF tool (no CrewAI!)
-                print("[TIER 0] 📄 PDF query - Direct tool call")
+                logger.debug("[TIER 0] 📄 PDF query - Direct tool call")
                 result = self._direct_pdf_query(user_query, session_id)
                 
             elif query_type == "URL_QUERY":
                 # TIER 0: Direct URL tool (no CrewAI!)
-                print("[TIER 0] 🌐 URL query - Direct tool call")
+                logger.debug("[TIER 0] 🌐 URL query - Direct tool call")
                 result = self._direct_url_query(user_query, session_id)
                 
             elif query_type == "SIMPLE_LIST":
                 # Use TIER 2 for list queries (LLM formatting is more reliable than regex)
-                print("[TIER 2] 📋 Simple list query - Using LLM to format database results")
+                logger.debug("[TIER 2] 📋 Simple list query - Using LLM to format database results")
                 result = self._basic_lookup(user_query, vector_results)
                 
             elif query_type == "BASIC_LOOKUP":
                 # TIER 2: Single tool use
-                print("[TIER 2] 🔍 Basic lookup - Minimal tool use")
+                logger.debug("[TIER 2] 🔍 Basic lookup - Minimal tool use")
                 result = self._basic_lookup(user_query, vector_results)
                 
             else:
                 # TIER 3: Full multi-agent
-                print("[TIER 3] 🤖 Complex query - Full CrewAI agents")
-                result = self._complex_query(user_query, vector_results, conversation_history, session_id)
+                logger.debug("[TIER 3] 🤖 Complex query - Full CrewAI agents")
+                result = self._complex_query(user_query, vector_results, conversation_history, session_id, user_urls)
             
             # Post-processing
-            print("\n[POST-PROCESSING] 🧹 Cleaning output...")
+            logger.debug("[POST-PROCESSING] 🧹 Cleaning output...")
             result = self._filter_personal_info(result)
             result = self._deduplicate_gentle(result)
             
-            print("\n" + "=" * 70)
-            print("✅ QUERY PROCESSING COMPLETE")
-            print("=" * 70)
+            logger.debug("=" * 70)
+            logger.debug("✅ QUERY PROCESSING COMPLETE")
+            logger.debug("=" * 70)
             
             return result
             
         except Exception as e:
-            print(f"\n❌ ERROR: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ ERROR: %s", e)
             return self._emergency_fallback(user_query)
     
     def _detect_query_type(self, query: str, vector_results: str = "") -> str:
@@ -146,13 +222,13 @@ class SimpleRAG:
         # Check for PDF query
         for pattern in pdf_keywords:
             if re.search(pattern, query_lower):
-                print(f"[ROUTING] 📄 PDF query detected → Direct PDF tool (TIER 0)")
+                logger.debug("[ROUTING] 📄 PDF query detected → Direct PDF tool (TIER 0)")
                 return "PDF_QUERY"
         
         # Check for URL query
         for pattern in url_keywords:
             if re.search(pattern, query_lower):
-                print(f"[ROUTING] 🌐 URL query detected → Direct URL tool (TIER 0)")
+                logger.debug("[ROUTING] 🌐 URL query detected → Direct URL tool (TIER 0)")
                 return "URL_QUERY"
         
         # TIER 1: Simple list queries
@@ -189,10 +265,13 @@ class SimpleRAG:
             if re.search(pattern, query_lower) and has_person_name:
                 # ✅ If database has rich results (>10KB), use TIER 2 (FAST!)
                 if len(vector_results) > 10000:
-                    print(f"[ROUTING] Person query with RICH database ({len(vector_results)} chars) → TIER 2 (Fast LLM formatting)")
+                    logger.debug("[ROUTING] Person query with RICH database (%d chars) → TIER 2 (Fast LLM formatting)", len(vector_results))
+                    return "BASIC_LOOKUP"
+                elif self._is_db_sufficient(query, vector_results):
+                    logger.info("[ROUTING] DB sufficient; skipping scrape → TIER 2")
                     return "BASIC_LOOKUP"
                 else:
-                    print(f"[ROUTING] Person query with LIMITED database ({len(vector_results)} chars) → TIER 3 (External enrichment)")
+                    logger.debug("[ROUTING] Person query with LIMITED database (%d chars) → TIER 3 (External enrichment)", len(vector_results))
                     return "COMPLEX"
         
         # TIER 2: Publication queries with HYBRID detection (Regex + Semantic Similarity)
@@ -216,22 +295,22 @@ class SimpleRAG:
         if not regex_match:
             try:
                 similarity = self._compute_semantic_similarity(query, "publication")
-                print(f"[SEMANTIC] Publication similarity: {similarity:.3f}")
+                logger.debug("[SEMANTIC] Publication similarity: %.3f", similarity)
                 if similarity > 0.65:  # Threshold for publication queries
                     semantic_match = True
-                    print(f"[SEMANTIC] ✓ Detected publication query via semantic similarity!")
+                    logger.debug("[SEMANTIC] ✓ Detected publication query via semantic similarity!")
             except Exception as e:
-                print(f"[SEMANTIC] Similarity check failed: {e}")
+                logger.warning("[SEMANTIC] Similarity check failed: %s", e)
         
         # If either regex OR semantic detects publication query
         if regex_match or semantic_match:
             detection_method = "regex" if regex_match else "semantic"
             # Check if we have person name + rich database
             if len(vector_results) > 5000:
-                print(f"[ROUTING] Publication query ({detection_method}) with RICH database ({len(vector_results)} chars) → TIER 2 (Fast LLM formatting)")
+                logger.debug("[ROUTING] Publication query (%s) with RICH database (%d chars) → TIER 2 (Fast LLM formatting)", detection_method, len(vector_results))
                 return "BASIC_LOOKUP"
             else:
-                print(f"[ROUTING] Publication query ({detection_method}) with LIMITED database ({len(vector_results)} chars) → TIER 3 (Tool needed)")
+                logger.debug("[ROUTING] Publication query (%s) with LIMITED database (%d chars) → TIER 3 (Tool needed)", detection_method, len(vector_results))
                 return "COMPLEX"
         
         # TIER 3 indicators: Complex queries needing multi-step analysis
@@ -244,18 +323,42 @@ class SimpleRAG:
         
         for pattern in complex_indicators:
             if re.search(pattern, query_lower):
-                print(f"[ROUTING] Complex analysis needed → TIER 3")
+                logger.debug("[ROUTING] Complex analysis needed → TIER 3")
                 return "COMPLEX"
         
         # Default: TIER 3 for safety
         return "COMPLEX"
     
+    def _is_db_sufficient(self, query: str, vector_results: str) -> bool:
+        """
+        Check whether the vector search alone can answer a person lookup, so TIER 3
+        (CrewAI + web scraping, the slowest path) can be skipped.
+        
+        Sufficient = a non-trivial amount of data that mentions every name token
+        (capitalized word longer than 3 chars) from the query.
+        """
+        if len(vector_results) <= 1500:
+            return False
+        
+        name_tokens = {
+            token.lower() for token in re.findall(r'\b[A-Z][a-z]{3,}\b', query)
+        } - self._QUERY_WORDS
+        if not name_tokens:
+            return False
+        
+        results_lower = vector_results.lower()
+        return all(token in results_lower for token in name_tokens)
+    
+    def _llm_for(self, intent: str) -> LLM:
+        """The LLM whose max_tokens matches the response intent."""
+        return self._intent_llms[intent]
+    
     def _direct_list_answer(self, query: str, vector_results: str) -> str:
         """
         TIER 1: Direct answer for simple list queries.
         NO TOOLS. Just extract and format from RAG results.
         """
-        print("[TIER 1] Extracting names from database...")
+        logger.debug("[TIER 1] Extracting names from database...")
         
         # Extract lecturer names - SIMPLIFIED APPROACH
         # Data format: "Name., Degree. NextName., Degree."
@@ -272,24 +375,25 @@ class SimpleRAG:
         
         matches = re.findall(pattern, text)
         
-        print(f"[TIER 1] Found {len(matches)} raw matches")
+        logger.debug("[TIER 1] Found %d raw matches", len(matches))
         
-        for idx, match in enumerate(matches[:5]):  # Debug: show first 5
-            print(f"[TIER 1 DEBUG] Match {idx+1}: '{match[:80]}...' (len={len(match)})")
+        if logger.isEnabledFor(logging.DEBUG):
+            for idx, match in enumerate(matches[:5]):  # Debug: show first 5
+                logger.debug("[TIER 1 DEBUG] Match %d: '%s...' (len=%d)", idx + 1, match[:80], len(match))
         
         for match in matches:
             match = match.strip()
             
             # Skip if it's a noise word
             if any(noise in match for noise in ['LECTURER', 'PROFESSOR', 'ASSISTANT', 'ASSOCIATE', 'EMERITUS', 'ADJUNCT']):
-                print(f"[TIER 1 SKIP] Noise word: {match[:40]}")
+                logger.debug("[TIER 1 SKIP] Noise word: %s", match[:40])
                 continue
             
             # Relaxed validation: just need comma (indicates degree)
             if ',' in match and len(match) > 10:
                 names.add(match)
             else:
-                print(f"[TIER 1 SKIP] No comma or too short: {match[:40]}")
+                logger.debug("[TIER 1 SKIP] No comma or too short: %s", match[:40])
         
         if not names:
             return "⚠️ No lecturers found in database. Please try a different query."
@@ -332,7 +436,7 @@ class SimpleRAG:
         output += f"\n📊 **Total:** {len(sorted_names)} lecturers\n"
         output += f"💡 **Source:** Academic Database (Astra DB)\n"
         
-        print(f"[TIER 1] ✓ Formatted {len(sorted_names)} unique names")
+        logger.debug("[TIER 1] ✓ Formatted %d unique names", len(sorted_names))
         return output
     
     def _basic_lookup(self, query: str, vector_results: str) -> str:
@@ -340,64 +444,37 @@ class SimpleRAG:
         TIER 2: Basic lookup with minimal tool use.
         Use LLM to format RAG results nicely.
         """
-        print("[TIER 2] Using LLM to format database results...")
+        logger.debug("[TIER 2] Using LLM to format database results...")
         
         # Check if this is a list query
         query_lower = query.lower()
         is_list_query = any(keyword in query_lower for keyword in ['list', 'all', 'daftar', 'semua'])
         
         if is_list_query:
-            prompt = f"""Extract and list ALL lecturer names from the database information below.
+            prompt = f"""{self._LIST_HEADER}
 
 Query: {query}
 
 Database Information:
 {vector_results}
 
-CRITICAL INSTRUCTIONS:
-1. Extract COMPLETE names only (e.g., "Dr. Abdul Muis., ST., M.Eng.")
-2. Skip INCOMPLETE names (e.g., "F. Astha" without full name)
-3. Remove EXACT duplicates (e.g., if "Tomy Abuzairi" and "Abuzairi" both appear, keep only the longer one)
-4. Format as a clean numbered list
-5. Group by academic title: Professors (Prof.) first, then Doctors (Dr.), then Lecturers
-6. DO NOT add position or research areas - NAMES ONLY
-7. DO NOT include partial names, truncated names, or incomplete entries
-
-Output format:
-## Professors
-1. [Full name with all titles and degrees]
-2. [Full name with all titles and degrees]
-
-## Doctors & Senior Lecturers
-1. [Full name with all titles and degrees]
-
-## Lecturers
-1. [Full name with all titles and degrees]
-
-Extract names now:"""
+{self._LIST_INSTRUCTIONS}"""
         else:
-            prompt = f"""You are an academic assistant. Answer this query based ONLY on the provided database information.
+            prompt = f"""{self._LOOKUP_HEADER}
 
 Query: {query}
 
 Database Information:
 {vector_results[:3000]}
 
-Instructions:
-1. Answer concisely (max 300 words)
-2. Use ONLY information from the database above
-3. Format nicely with markdown
-4. Include: name, position, research areas (if available)
-5. DO NOT make up information
-6. DO NOT include personal details (birth date, family, etc.)
-
-Answer:"""
+{self._LOOKUP_INSTRUCTIONS}"""
         
         try:
-            response = self.llm.call([{"role": "user", "content": prompt}])
+            intent = 'list' if is_list_query else 'lookup'
+            response = self._llm_for(intent).call([{"role": "user", "content": prompt}])
             return str(response)
         except Exception as e:
-            print(f"[TIER 2] LLM error: {e}")
+            logger.warning("[TIER 2] LLM error: %s", e)
             # Fallback to raw results
             return f"Based on database:\n\n{vector_results[:1000]}"
     
@@ -406,7 +483,7 @@ Answer:"""
         TIER 0: Direct PDF tool call (NO CrewAI agents!)
         Ultra-fast response for PDF queries.
         """
-        print("[TIER 0] 📄 Calling PDF tool directly...")
+        logger.debug("[TIER 0] 📄 Calling PDF tool directly...")
         
         try:
             # Call PDF tool directly
@@ -416,24 +493,18 @@ Answer:"""
                 return "❌ **Tidak ada PDF yang ditemukan**\n\nSilakan upload PDF terlebih dahulu menggunakan tombol 📎 di bawah."
             
             # Format with LLM for better presentation
-            prompt = f"""Ringkas dan jelaskan isi PDF berikut dalam bahasa Indonesia yang mudah dipahami.
+            prompt = f"""{self._SUMMARY_HEADERS["PDF"]}
 
 Isi PDF:
 {result[:4000]}
 
-INSTRUKSI:
-1. Gunakan format markdown yang rapi (## untuk header, - untuk bullet points)
-2. Buat ringkasan yang jelas dan terstruktur
-3. Jangan tambahkan informasi yang tidak ada di PDF
-4. Maksimal 400 kata
-
-Ringkasan:"""
+{self._SUMMARY_INSTRUCTIONS["PDF"]}"""
             
-            formatted = self.llm.call([{"role": "user", "content": prompt}])
+            formatted = self._llm_for('summary').call([{"role": "user", "content": prompt}])
             return str(formatted)
             
         except Exception as e:
-            print(f"[TIER 0] PDF tool error: {e}")
+            logger.warning("[TIER 0] PDF tool error: %s", e)
             return f"⚠️ Error saat membaca PDF: {str(e)}\n\nSilakan coba lagi atau upload PDF yang berbeda."
     
     def _direct_url_query(self, query: str, session_id: str = None) -> str:
@@ -441,7 +512,7 @@ Ringkasan:"""
         TIER 0: Direct URL tool call (NO CrewAI agents!)
         Ultra-fast response for URL queries.
         """
-        print("[TIER 0] 🌐 Calling URL tool directly...")
+        logger.debug("[TIER 0] 🌐 Calling URL tool directly...")
         
         try:
             # Call URL tool directly
@@ -451,45 +522,41 @@ Ringkasan:"""
                 return "❌ **Tidak ada URL yang ditemukan**\n\nSilakan upload URL terlebih dahulu menggunakan tombol 🔗 di bawah."
             
             # Format with LLM for better presentation
-            prompt = f"""Ringkas dan jelaskan isi website/URL berikut dalam bahasa Indonesia yang mudah dipahami.
+            prompt = f"""{self._SUMMARY_HEADERS["website"]}
 
 Isi Website:
 {result[:4000]}
 
-INSTRUKSI:
-1. Gunakan format markdown yang rapi (## untuk header, - untuk bullet points)
-2. Buat ringkasan yang jelas dan terstruktur
-3. Jangan tambahkan informasi yang tidak ada di website
-4. Maksimal 400 kata
-
-Ringkasan:"""
+{self._SUMMARY_INSTRUCTIONS["website"]}"""
             
-            formatted = self.llm.call([{"role": "user", "content": prompt}])
+            formatted = self._llm_for('summary').call([{"role": "user", "content": prompt}])
             return str(formatted)
             
         except Exception as e:
-            print(f"[TIER 0] URL tool error: {e}")
+            logger.warning("[TIER 0] URL tool error: %s", e)
             return f"⚠️ Error saat membaca URL: {str(e)}\n\nSilakan coba lagi atau upload URL yang berbeda."
     
-    def _complex_query(self, query: str, vector_results: str, conversation_history: list = None, session_id: str = None) -> str:
+    def _complex_query(self, query: str, vector_results: str, conversation_history: list = None, session_id: str = None,
+                       user_urls: list = None) -> str:
         """
         TIER 3: Complex query with full CrewAI multi-agent system.
+        The user's URLs go along so HybridRAG scrapes them (through its URL memo).
         """
-        print("[TIER 3] Launching full CrewAI system...")
+        logger.debug("[TIER 3] Launching full CrewAI system...")
         
         # Use existing complex agent logic
-        from agent_core import HybridRAG
-        hybrid_rag = HybridRAG()
-        return hybrid_rag.query(query, user_urls=None, conversation_history=conversation_history, session_id=session_id)
+        from agent_core import get_rag
+        hybrid_rag = get_rag()
+        return hybrid_rag.query(query, user_urls=user_urls, conversation_history=conversation_history, session_id=session_id)
     
     def _vector_search(self, query: str) -> str:
         """Search the Astra DB vector database."""
         try:
             result = academic_search_tool._run(query)
-            print(f"  ✓ Vector search returned {len(result)} characters")
+            logger.debug("  ✓ Vector search returned %d characters", len(result))
             return result
         except Exception as e:
-            print(f"  ✗ Vector search failed: {e}")
+            logger.warning("  ✗ Vector search failed: %s", e)
             return ""
     
     def _filter_personal_info(self, text: str) -> str:
@@ -594,14 +661,14 @@ Ringkasan:"""
                 "list": "list all lecturers professors faculty staff members",
             }
             
-            print("[INIT] 🔧 Pre-computing query type embeddings...")
+            logger.debug("[INIT] 🔧 Pre-computing query type embeddings...")
             for query_type, example_text in query_type_examples.items():
                 embedding = self.embeddings.embed_query(example_text)
                 self._query_type_embeddings[query_type] = embedding
-            print(f"[INIT] ✓ Cached {len(self._query_type_embeddings)} query type embeddings")
+            logger.debug("[INIT] ✓ Cached %d query type embeddings", len(self._query_type_embeddings))
             
         except Exception as e:
-            print(f"[INIT] ⚠️ Failed to pre-compute embeddings: {e}")
+            logger.warning("[INIT] ⚠️ Failed to pre-compute embeddings: %s", e)
             self._query_type_embeddings = {}
     
     def _compute_semantic_similarity(self, query: str, query_type: str) -> float:
@@ -621,7 +688,7 @@ Ringkasan:"""
             
             # Get cached type embedding
             if query_type not in self._query_type_embeddings:
-                print(f"[SEMANTIC] Warning: No cached embedding for '{query_type}'")
+                logger.warning("[SEMANTIC] Warning: No cached embedding for '%s'", query_type)
                 return 0.0
             
             type_embedding = self._query_type_embeddings[query_type]
@@ -640,7 +707,7 @@ Ringkasan:"""
             return float(similarity)
             
         except Exception as e:
-            print(f"[SEMANTIC] Error computing similarity: {e}")
+            logger.warning("[SEMANTIC] Error computing similarity: %s", e)
             return 0.0
     
     def _emergency_fallback(self, query: str) -> str:
@@ -665,5 +732,6 @@ def run_simple_rag(user_query: str, user_urls: list = None, conversation_history
     """
     Main entry point for simplified RAG system.
     """
-    simple_rag = SimpleRAG()
+    # Reuse the singleton: building SimpleRAG embeds the query-type examples via API
+    simple_rag = get_simple_rag()
     return simple_rag.query(user_query, user_urls, conversation_history, session_id)
@@ -5,227 +5,1156 @@ This module uses AI agents to intelligently gather and structure CV data from mu
 
 import os
 from dotenv import load_dotenv
-from crewai import Agent, Task, Crew, LLM
-from tools import (
-    academic_search_tool,
-    google_scholar_tool,
-    web_search_tool,
-    dynamic_web_scraper_tool,
-    ui_scholar_search_tool,  # Add UI Scholar tool
-    eng_ui_personnel_scraper_tool  # NEW: Official eng.ui.ac.id personnel scraper
-)
-from cv_prompts import get_cv_generation_prompt  # 🔥 NEW: Import simplified prompt
-import re
 
+# Before the cv_prompts import (CV_PROMPT_DIR) and every CV_* setting below; variables
+# already set in the environment are never overridden
 load_dotenv()
 
-# Initialize LLM for agents with MUCH higher token limit for comprehensive CVs
-# Using gemini-2.5-pro (latest & best) for SUPERIOR instruction following
-llm = LLM(
-    model="gemini/gemini-2.5-pro",  # Latest Gemini model - best instruction following
-    api_key=os.getenv("GEMINI_API_KEY"),
-    temperature=0.1,  # Slightly increased from 0.0 to allow more creativity in extraction
-    max_tokens=16000,  # Need space for 15-20 publications with full details
+from cv_prompts import get_cv_generation_prompt, get_cv_batch_prompt, PROMPT_VERSION  # 🔥 NEW: Import simplified prompt
+import cv_cache
+import re
+import json
+import hashlib
+import functools
+import time
+import asyncio
+import logging
+import log_setup
+from collections import namedtuple
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+
+try:
+    # Optional: google-re2's DFA engine for the key-info extraction patterns (all linear-safe)
+    import re2 as _extract_re
+except ImportError:
+    _extract_re = re
+
+logger = log_setup.configure("cv_agent")
+
+# litellm and tools (LangChain, Astra, scrapers) are imported lazily inside the
+# functions that need them, so `import cv_agent` stays cheap.
+
+# Main CV model - gemini-2.5-pro for the best instruction following; every request is its
+# own stateless litellm.completion() call built from these settings (see _completion_kwargs)
+CV_LLM_MODEL = "gemini/gemini-2.5-pro"
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# 0.0 = identical sources give an identical CV (and a reusable LLM cache entry)
+CV_LLM_TEMPERATURE = float(os.getenv("CV_LLM_TEMPERATURE", "0.0"))
+# Room for 15-20 publications with full details plus Gemini 2.5 thinking tokens,
+# which count against this cap; 16000 only invited padding and longer worst-case latency
+CV_LLM_MAX_TOKENS = int(os.getenv("CV_LLM_MAX_TOKENS", "8192"))
+
+# Max seconds to wait for each data-source tool during CV generation
+TOOL_TIMEOUT = 30
+
+# Retries (with exponential backoff) when the LLM provider rate-limits us
+LLM_MAX_RETRIES = 3
+
+# Max seconds for one LLM request; a hung call fails fast into the reduced-context retry
+LLM_TIMEOUT = float(os.getenv("CV_LLM_TIMEOUT", "120"))
+
+# Max seconds for all LLM work on one CV (draft, escalation, reduced-context retry and
+# rate-limit backoff together); streamed generations are cut off when it passes
+CV_LLM_DEADLINE = float(os.getenv("CV_LLM_DEADLINE", "240"))
+
+# Successful tool outputs are cached for a day (faculty data changes slowly)
+TOOL_CACHE_TTL = 24 * 60 * 60
+
+# Finished CVs are cached per professor for the same period
+CV_RESULT_CACHE_TTL = 24 * 60 * 60
+
+# LLM outputs are keyed by the exact prompt, so they never go stale - the TTL only
+# keeps the cache file from growing without bound as source data changes
+LLM_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Opt-in: ask the LLM for JSON (cv_schema.CVModel) and render the markdown ourselves
+CV_STRUCTURED_OUTPUT = os.getenv("CV_STRUCTURED_OUTPUT", "").lower() in ("1", "true", "yes")
+
+# Opt-in: one parallel structured LLM call per source, merged in Python (implies JSON output)
+CV_MAP_REDUCE = os.getenv("CV_MAP_REDUCE", "").lower() in ("1", "true", "yes")
+
+# Optional cheaper model (e.g. "gemini/gemini-2.5-flash") for the per-source extraction calls
+# of map-reduce; unset = use the main CV model. Its output is one source's JSON, so it needs
+# far fewer tokens than a full markdown CV.
+CV_EXTRACT_MODEL = os.getenv("CV_EXTRACT_MODEL")
+CV_EXTRACT_MAX_TOKENS = int(os.getenv("CV_EXTRACT_MAX_TOKENS", "4096"))
+
+# Cheaper, faster model that writes the first draft of every CV; the main model (Pro) only
+# runs again when the draft fails validation. Set CV_DRAFT_MODEL="" to always use the main model.
+CV_DRAFT_MODEL = os.getenv("CV_DRAFT_MODEL", "gemini/gemini-2.5-flash")
+# A draft with fewer publications than this is regenerated with the main model
+CV_MIN_PUBLICATIONS = 8
+
+# With this many dated publication candidates plus a name and birth record, the CV is
+# filled in deterministically and the LLM is skipped
+CV_TEMPLATE_MIN_PUBLICATIONS = 10
+CV_TEMPLATE_MAX_PUBLICATIONS = 15
+# Cross-source near-duplicate line removal: word window size and overlap threshold
+SHINGLE_WORDS = 5
+DUPLICATE_LINE_OVERLAP = 0.7
+
+# Professors per LLM call in simplified_cv_generation_batch (each CV gets the usual
+# max_tokens, so the batch's output budget grows with it)
+CV_BATCH_SIZE = 4
+
+# Most publication candidates handed to the LLM in the prompt's JSON block
+MAX_PROMPT_CANDIDATES = 25
+
+# Prompt section per source: (CollectedData field, heading, text when unavailable)
+_SOURCE_SECTIONS = (
+    ('eng_ui_personnel', '🌐 ENG.UI.AC.ID OFFICIAL PERSONNEL PAGE (from eng.ui.ac.id - AUTHORITATIVE SOURCE)',
+     'Not available - will use fallback sources'),
+    ('database', 'DATABASE INFORMATION (from RAG vector database)', 'Not available'),
+    ('ui_scholar', 'UI SCHOLAR PUBLICATIONS (from scholar.ui.ac.id - PRIMARY SOURCE for UI faculty)', 'Not available'),
+    ('scholar', 'GOOGLE SCHOLAR PUBLICATIONS (from Google Scholar API)', 'Not available'),
+)
+# Merge order for map-reduce: official page first for personal data, UI Scholar first for publications
+_FIELD_PRIORITY = ('eng_ui_personnel', 'database', 'ui_scholar', 'scholar')
+_PUBLICATION_PRIORITY = ('ui_scholar', 'eng_ui_personnel', 'database', 'scholar')
+_SOURCE_LABELS = {
+    'eng_ui_personnel': 'ENG.UI.AC.ID',
+    'database': 'Database',
+    'ui_scholar': 'UI Scholar',
+    'scholar': 'Google Scholar',
+}
+
+# Token budget for all source text in the prompt (replaces the old fixed 3500/3000/2500/2500
+# char caps, ~2900 tokens in total); the template and output are budgeted separately
+SOURCE_TOKEN_BUDGET = int(os.getenv("CV_SOURCE_TOKEN_BUDGET", "2900"))
+CHARS_PER_TOKEN = 4  # Heuristic for Latin-script text
+# Fair share of the budget per source; whatever a source doesn't need goes to the others
+SOURCE_BUDGET_SHARES = {
+    'eng_ui_personnel': 0.30,
+    'database': 0.26,
+    'ui_scholar': 0.22,
+    'scholar': 0.22,
+}
+# No single source can use more than the whole budget
+_SOURCE_MAX_CHARS = SOURCE_TOKEN_BUDGET * CHARS_PER_TOKEN
+
+# Less usable source text than this (all sources together) can't describe a professor;
+# the LLM is skipped and the fallback CV returned instead
+MIN_SOURCE_CHARS = 200
+
+# Prefixes the tools use when they return an error/warning message instead of data
+TOOL_ERROR_PREFIXES = ('⚠️', '❌', 'Error', 'Database error', 'Unexpected error', 'No Google Scholar results')
+
+# "[at]" email obfuscation in any spacing/case ("name [ AT ] ui.ac.id"); spaces/tabs only,
+# so a line ending in "[at]" never swallows the following newline
+_AT_RE = re.compile(r'[ \t]*\[[ \t]*at[ \t]*\][ \t]*', re.IGNORECASE)
+
+# Cleaning keeps line structure (one entry/field per line) so the budget step can drop
+# whole low-value lines: runs of spaces collapse to ' ', runs containing a newline to '\n'
+_HSPACE_RE = re.compile(r'[^\S\n]+')
+_NEWLINE_RUN_RE = re.compile(r' ?\n\s*')
+# Non-whitespace control characters → deleted via str.translate (whitespace ones like
+# \r or \x0c are left for the whitespace collapse so they still separate words)
+_CTRL_MAP = dict.fromkeys(c for c in range(32) if not chr(c).isspace())
+# Extraction patterns compile with re2 when installed (flags inline so both engines accept them);
+# the whitespace patterns stay on stdlib re because RE2's \s doesn't match Unicode spaces like \xa0
+# Titled name ("Prof. Dr. Ir. ...") first, within the head of the text where profiles put it;
+# the unanchored any-capitalized-words pattern is only the fallback
+_TITLED_NAME_RE = _extract_re.compile(r'(?:(?:Prof|Dr|Ir)\.\s*)+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)')
+_NAME_HEAD_CHARS = 500
+_NAME_RE = _extract_re.compile(r'(?:Prof\.\s*)?(?:Dr\.\s*)?(?:Ir\.\s*)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)')
+_BIRTH_RE = _extract_re.compile(r'(?i)(?:Lahir|Born)(?:\s*:)?\s*([^,\n]+,\s*\d{4})')
+_SINTA_RE = _extract_re.compile(r'SINTA Score[:\s]+(\d+\.?\d*)')
+# Research-area keywords: add new ones here, the single-scan pattern is built from this tuple.
+# A trailing plural 's' is allowed outside the group ("Computer Networks") so the captured
+# text still maps through _RESEARCH_CANONICAL
+RESEARCH_AREAS = ('Protocol Engineering', 'Computer Network', 'IoT', 'ICT implementation', 'University ranking')
+_RESEARCH_RE = _extract_re.compile(
+    r'(?i)\b(' + '|'.join(re.escape(area) for area in sorted(RESEARCH_AREAS, key=len, reverse=True)) + r')s?\b'
+)
+# Canonical spelling for each research-area keyword, keyed by lowercase match
+_RESEARCH_CANONICAL = {area.lower(): area for area in RESEARCH_AREAS}
+# Numbered publication entries as the tools format them: "1. **Title**" (UI Scholar, Google
+# Scholar) or "1. Title (2024)" (eng.ui.ac.id); years are looked up on the entry's lines
+_PUB_ENTRY_RE = re.compile(r'^\s*\d+\.\s+(.+?)\s*$', re.MULTILINE)
+_PUB_TRAILING_YEAR_RE = re.compile(r'\s*\((?:(19\d{2}|20\d{2})|Year unknown)\)$')
+_YEAR_RE = re.compile(r'\b(19[5-9]\d|20\d{2})\b')
+# Line scoring for budget trimming: publication fields are worth keeping, site chrome isn't
+_PUB_FIELD_LINE_RE = re.compile(r'(?i)\b(?:Title|Authors?|Journal|Conference|Year)\s*:')
+_PUBLICATIONS_HEADER_RE = re.compile(r'^##[ \t]+(?:SELECTED[ \t]+)?PUBLICATIONS\b.*$', re.MULTILINE | re.IGNORECASE)
+_SECTION_HEADER_RE = re.compile(r'^#{1,2}[ \t]', re.MULTILINE)
+_NUMBERED_PUB_RE = re.compile(r'^[ \t]*\d+\.\s+\*\*', re.MULTILINE)
+_BATCH_CV_MARKER_RE = re.compile(r'^#{2,3}\s*CV\s*\[(\d+)\]\s*$', re.MULTILINE)
+_AUTHOR_LINE_RE = re.compile(r'(?i)\s*(?:-\s*)?(?:Authors?|Penulis)\s*:')
+# Site chrome: lines made up only of navigation items ("Home | Login | Search"), cookie/
+# privacy banners and copyright footers - a title merely containing "Search" isn't one
+_BOILERPLATE_LINE_RE = re.compile(
+    r'(?i)^\W*(?:(?:Home|Login|Log in|Sign in|Search|Menu|Skip to (?:main )?content)\W*)+$'
+    r'|\b(?:uses cookies|accept cookies|cookie policy|privacy policy|all rights reserved)\b'
+    r'|©\s*\d{4}'
 )
+# A publication entry starts at a numbered line or a "Title:" field; its indented/bulleted
+# or "Field:" lines that follow belong to it (see _line_blocks)
+_ENTRY_START_RE = re.compile(r'(?i)^\s*(?:\d+[.)]\s|(?:-\s*)?Title\s*:)')
+_ENTRY_CONTINUATION_RE = re.compile(r'^(?:\s|-)')
+_MIN_PUB_TITLE_CHARS = 20
+_TITLE_NOISE_RE = re.compile(r'[\W_]+')
+
+@dataclass(slots=True)
+class CollectedData:
+    """Cleaned per-source outputs gathered for one CV (None = source unavailable)."""
+    eng_ui_personnel: str | None = None  # Official eng.ui.ac.id personnel page (HIGHEST PRIORITY)
+    database: str | None = None
+    ui_scholar: str | None = None
+    scholar: str | None = None
+    raw_info: dict = field(default_factory=dict)  # extract_key_info() fields, keys are dynamic
+    publication_candidates: list = field(default_factory=list)  # extract_publication_candidates(), deduplicated
+    
+    def sources_used(self) -> list:
+        return [name for name in ('eng_ui_personnel', 'database', 'ui_scholar', 'scholar') if getattr(self, name)]
+    
+    def has_source_data(self) -> bool:
+        """
+        True if the sources returned real data: tool error/warning messages don't count,
+        and a few short "no results" style lines together (< MIN_SOURCE_CHARS) aren't enough.
+        """
+        texts = (getattr(self, name) for name in self.sources_used())
+        usable_chars = sum(len(text) for text in texts if not _looks_like_tool_error(text))
+        return usable_chars >= MIN_SOURCE_CHARS
+
+def _strip_tags(text: str) -> str:
+    """
+    Remove HTML-like tags (same result as re.sub(r'<[^>]+>', '', text)) in a single
+    forward pass using str.find, without going through the regex engine.
+    """
+    if '<' not in text:
+        return text
+    
+    parts = []
+    pos = 0
+    while True:
+        lt = text.find('<', pos)
+        if lt == -1:
+            break
+        gt = text.find('>', lt + 1)
+        if gt == -1:
+            break
+        if gt == lt + 1:
+            # "<>" is not a tag - keep it
+            parts.append(text[pos:gt + 1])
+        else:
+            parts.append(text[pos:lt])
+        pos = gt + 1
+    parts.append(text[pos:])
+    return ''.join(parts)
 
 def clean_tool_output(text: str, max_chars: int = 3500) -> str:
     """Clean and truncate tool output to avoid context overflow."""
+    # Pre-truncate so cleaning only scans what can survive (2x headroom for stripped tags/whitespace)
+    if len(text) > max_chars * 2:
+        text = text[:max_chars * 2]
+    # Drop control characters scraped pages sometimes carry
+    text = text.translate(_CTRL_MAP)
     # Remove HTML-like tags
-    text = re.sub(r'<[^>]+>', '', text)
-    # Remove excessive whitespace
-    text = ' '.join(text.split())
+    text = _strip_tags(text)
+    return _collapse_and_truncate(text, max_chars)
+
+def _collapse_and_truncate(text: str, max_chars: int) -> str:
+    """Shared tail of clean_tool_output / clean_and_extract."""
+    # Remove excessive whitespace (C-level passes, no intermediate token list), keeping line breaks
+    text = _NEWLINE_RUN_RE.sub('\n', _HSPACE_RE.sub(' ', text)).strip()
     # Truncate if too long
     if len(text) > max_chars:
         text = text[:max_chars] + "..."
     return text
 
-def extract_key_info(text: str) -> dict:
-    """Extract key structured information from text."""
-    info = {
-        'name': '',
-        'title': '',
-        'birth': '',
-        'affiliation': '',
-        'sinta_score': '',
-        'research_areas': [],
-        'education': []
-    }
+KeyInfo = namedtuple('KeyInfo', ['name', 'title', 'birth', 'affiliation', 'sinta_score', 'research_areas', 'education'])
+
+@functools.lru_cache(maxsize=256)
+def _extract_key_info_cached(text: str) -> KeyInfo:
+    """Memoized extraction; returns an immutable KeyInfo so cached results can't be mutated."""
+    name = ''
+    birth = ''
+    sinta_score = ''
     
     # Extract name with title
-    name_match = re.search(r'(?:Prof\.\s*)?(?:Dr\.\s*)?(?:Ir\.\s*)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)', text)
+    name_match = _TITLED_NAME_RE.search(text, 0, _NAME_HEAD_CHARS) or _NAME_RE.search(text)
     if name_match:
-        info['name'] = name_match.group(0)
+        name = name_match.group(0)
     
     # Extract birth info
-    birth_match = re.search(r'(?:Lahir|Born)(?:\s*:)?\s*([^,\n]+,\s*\d{4})', text, re.IGNORECASE)
+    birth_match = _BIRTH_RE.search(text)
     if birth_match:
-        info['birth'] = birth_match.group(1)
-    
-    # Extract SINTA score
-    sinta_match = re.search(r'SINTA Score[:\s]+(\d+\.?\d*)', text)
-    if sinta_match:
-        info['sinta_score'] = sinta_match.group(1)
-    
-    # Extract research areas
-    research_patterns = [
-        r'Protocol Engineering',
-        r'Computer Network',
-        r'IoT',
-        r'ICT implementation',
-        r'University ranking'
-    ]
-    for pattern in research_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            info['research_areas'].append(pattern)
+        birth = birth_match.group(1)
+    
+    # Extract SINTA score (literal prefix: a plain find skips the regex for the many
+    # outputs without one, and otherwise starts it at the first occurrence)
+    sinta_pos = text.find('SINTA Score')
+    if sinta_pos != -1:
+        sinta_match = _SINTA_RE.search(text, sinta_pos)
+        if sinta_match:
+            sinta_score = sinta_match.group(1)
     
+    # Extract research areas (single pass over the text for all keywords,
+    # deduplicated in order of first appearance with canonical casing)
+    research_areas = tuple({
+        match.lower(): _RESEARCH_CANONICAL[match.lower()]
+        for match in _RESEARCH_RE.findall(text)
+    }.values())
+    
+    return KeyInfo(
+        name=name,
+        title='',
+        birth=birth,
+        affiliation='',
+        sinta_score=sinta_score,
+        research_areas=research_areas,
+        education=()
+    )
+
+def extract_key_info(text: str) -> dict:
+    """Extract key structured information from text."""
+    info = _extract_key_info_cached(text)._asdict()
+    info['research_areas'] = list(info['research_areas'])
+    info['education'] = list(info['education'])
     return info
 
-def simplified_cv_generation(professor_name: str, session_id: str = None) -> dict:
+def clean_and_extract(text: str, max_chars: int = 3500):
     """
-    Simplified CV generation that avoids LLM context overflow.
-    Direct tool usage with pre-processed outputs.
+    clean_tool_output + extract_key_info sharing one control-char/tag pass over the text.
+    Extraction sees the full tag-stripped text (line breaks intact); only the cleaned copy
+    is whitespace-collapsed and truncated. Returns (cleaned_text, info_dict).
     """
+    stripped = _strip_tags(text.translate(_CTRL_MAP))
+    info = extract_key_info(stripped)
+    return _collapse_and_truncate(stripped[:max_chars * 2], max_chars), info
+
+def extract_publication_candidates(text: str, source: str) -> list:
+    """
+    Deterministically pull numbered publication entries (title + year when present) out of
+    a raw tool output, so the LLM is handed verified titles instead of having to find them.
+    """
+    if _looks_like_tool_error(text):
+        return []  # Numbered lines in error/fallback messages are instructions, not papers
     
-    print("\n" + "="*80)
-    print(f"🤖 SIMPLIFIED CV GENERATION FOR: {professor_name}")
-    print("="*80)
+    candidates = []
+    matches = list(_PUB_ENTRY_RE.finditer(text))
+    for i, match in enumerate(matches):
+        title = match.group(1).replace('**', '').strip()
+        year = ''
+        trailing = _PUB_TRAILING_YEAR_RE.search(title)
+        if trailing:
+            year = trailing.group(1) or ''
+            title = title[:trailing.start()]
+        if len(title) < _MIN_PUB_TITLE_CHARS:
+            continue
+        if not year:
+            # Year from the entry's detail lines (e.g. Google Scholar "Authors: ... - Venue, 2021")
+            entry_end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            year_match = _YEAR_RE.search(text, match.end(), entry_end)
+            if year_match:
+                year = year_match.group(1)
+        candidates.append({'title': title, 'year': year, 'source': source})
+    return candidates
+
+def _title_key(title: str) -> str:
+    """Normalized title for duplicate detection: case, punctuation and spacing ignored."""
+    return _TITLE_NOISE_RE.sub(' ', title.lower()).strip()
+
+def dedupe_publications(candidates: list) -> list:
+    """
+    Merge the same paper listed by several sources (formatting differs slightly between
+    them) into one candidate, keeping the entry from the highest-priority source in
+    _PUBLICATION_PRIORITY and filling in its year from a duplicate if it had none.
+    """
+    merged = {}
+    for candidate in sorted(candidates, key=lambda c: _PUBLICATION_PRIORITY.index(c['source'])):
+        key = _title_key(candidate['title'])
+        kept = merged.get(key)
+        if kept is None:
+            merged[key] = dict(candidate)
+        elif not kept['year'] and candidate['year']:
+            kept['year'] = candidate['year']
+    return list(merged.values())
+
+def _looks_like_tool_error(output: str) -> bool:
+    """Tools report failures as text (warnings/errors) instead of raising."""
+    return output.lstrip().startswith(TOOL_ERROR_PREFIXES)
+
+def _tool_cache_key(tool, query: str) -> str:
+    return f"tool:{tool.name}:{query.strip().lower()}"
+
+def _cached_tool_run(tool, query: str, ttl: float = TOOL_CACHE_TTL, force_refresh: bool = False) -> str:
+    """
+    Run `tool._run(query)`, reusing a persisted successful result for the same tool+query.
+    force_refresh=True skips the lookup but still stores the fresh result.
+    """
+    cache_key = _tool_cache_key(tool, query)
+    cached = None if force_refresh else cv_cache.cache_get(cache_key)
+    if cached is not None:
+        logger.debug("  ✓ %s: cache hit for '%s'", tool.name, query)
+        return cached
     
-    collected_data = {
-        'eng_ui_personnel': None,  # NEW: Official eng.ui.ac.id personnel page (HIGHEST PRIORITY)
-        'database': None,
-        'ui_scholar': None,  # Add UI Scholar data
-        'scholar': None,
-        'raw_info': {}
+    output = tool._run(query)
+    if output and not _looks_like_tool_error(output):
+        cv_cache.cache_set(cache_key, output, ttl=ttl)
+    return output
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """True for provider rate-limit errors (litellm RateLimitError / HTTP 429)."""
+    return 'RateLimit' in type(error).__name__ or '429' in str(error)
+
+# litellm exception names worth one retry with a smaller prompt (matched by name, like
+# _is_rate_limit_error, so litellm stays a lazy import)
+_RETRYABLE_LLM_ERRORS = ('Timeout', 'ServiceUnavailable', 'InternalServerError', 'ContextWindowExceeded')
+
+def _is_retryable_llm_error(error: Exception) -> bool:
+    """True for timeouts, provider overloads (5xx) and context-window overflows - not auth/config errors."""
+    name = type(error).__name__
+    return (
+        isinstance(error, TimeoutError)
+        or any(retryable in name for retryable in _RETRYABLE_LLM_ERRORS)
+        or 'overloaded' in str(error).lower()
+    )
+
+def _time_left(deadline: float) -> float:
+    """Seconds until `deadline` (a time.monotonic() value); TimeoutError once it has passed."""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("CV generation deadline exceeded")
+    return remaining
+
+def _completion_kwargs(prompt: str, response_format=None, **overrides) -> dict:
+    """
+    litellm.completion() arguments for the CV LLM (the CV_LLM_* settings above).
+    `overrides` replace individual settings, e.g. model/max_tokens for extraction calls.
+    """
+    kwargs = {
+        "model": CV_LLM_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "api_key": GEMINI_API_KEY,
+        "temperature": CV_LLM_TEMPERATURE,
+        "max_tokens": CV_LLM_MAX_TOKENS,
+        "timeout": LLM_TIMEOUT,
     }
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+    kwargs.update(overrides)
+    return kwargs
+
+def _with_llm_retries(call, deadline: float = None):
+    """
+    Run `call()`, retrying with exponential backoff when the LLM provider rate-limits us
+    (never sleeping past `deadline`).
+    """
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            return call()
+        except Exception as e:
+            if attempt == LLM_MAX_RETRIES or not _is_rate_limit_error(e):
+                raise
+            delay = 2 ** attempt
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise
+            logger.warning("  ⏳ LLM rate limited, retrying in %ss (attempt %d/%d)...", delay, attempt + 1, LLM_MAX_RETRIES)
+            time.sleep(delay)
+
+def _call_llm(prompt: str, response_format=None, deadline: float = None, **overrides):
+    """
+    Call the CV LLM, retrying with exponential backoff when rate limited.
+    Goes straight to litellm (which CrewAI's LLM wraps) - this single-prompt path
+    needs none of the agent/event machinery of LLM.call().
+    """
+    import litellm
     
-    # Step 0: Try to get official data from eng.ui.ac.id FIRST (highest priority)
-    print("\n[0/5] 🌐 Collecting OFFICIAL data from eng.ui.ac.id personnel page...")
-    try:
-        eng_ui_result = eng_ui_personnel_scraper_tool._run(professor_name)
-        collected_data['eng_ui_personnel'] = clean_tool_output(eng_ui_result, 3500)
-        print(f"  ✓ ENG.UI.AC.ID: {len(eng_ui_result)} chars → {len(collected_data['eng_ui_personnel'])} chars (cleaned)")
-        print(f"  📋 This is the AUTHORITATIVE source for education, research expertise, and latest publications")
-    except Exception as e:
-        print(f"  ✗ ENG.UI.AC.ID error: {e}")
-        print(f"  ⚠️ Will use fallback sources (database, UI Scholar, Google Scholar)")
+    def _complete():
+        kwargs = _completion_kwargs(prompt, response_format, **overrides)
+        if deadline is not None:
+            kwargs["timeout"] = min(kwargs["timeout"], _time_left(deadline))
+        response = litellm.completion(**kwargs)
+        return response.choices[0].message.content
     
-    # Step 1: Collect data from tools with error handling
-    print("\n[1/5] Collecting data from Academic Database...")
-    try:
-        db_result = academic_search_tool._run(professor_name)
-        # Keep MORE data from database - increase from 1000 to 3000 chars
-        collected_data['database'] = clean_tool_output(db_result, 3000)
-        collected_data['raw_info'].update(extract_key_info(db_result))
-        print(f"  ✓ Database: {len(db_result)} chars → {len(collected_data['database'])} chars (cleaned)")
-    except Exception as e:
-        print(f"  ✗ Database error: {e}")
+    return _with_llm_retries(_complete, deadline)
+
+def _stream_llm(prompt: str, deadline: float = None, **overrides):
+    """
+    Yield the CV LLM's response text chunk by chunk as the provider generates it.
+    litellm's timeout only bounds each wait for data, so `deadline` is what caps the
+    total generation time: TimeoutError once it passes.
+    """
+    import litellm
     
-    print("\n[2/5] Collecting data from UI Scholar (scholar.ui.ac.id)...")
+    kwargs = _completion_kwargs(prompt, **overrides)
+    if deadline is not None:
+        kwargs["timeout"] = min(kwargs["timeout"], _time_left(deadline))
+    stream = litellm.completion(**kwargs, stream=True)
+    for chunk in stream:
+        if deadline is not None:
+            _time_left(deadline)
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+def _normalize_cv_text(cv_text: str) -> str:
+    """Convert [at] email notation to @ so the PDF generator gets real addresses."""
+    return _AT_RE.sub('@', cv_text)
+
+def _stream_cv_markdown(prompt: str, deadline: float = None, **overrides):
+    """
+    Yield the CV markdown as blocks of complete lines while it streams in, so an [at]
+    address split across deltas is still converted to @. The template ends with the
+    publications section and has no closing marker, so the stream runs until the model stops.
+    """
+    pending = ''
+    for delta in _stream_llm(prompt, deadline, **overrides):
+        pending += delta
+        if '\n' not in pending:
+            continue
+        complete, pending = pending.rsplit('\n', 1)
+        yield _normalize_cv_text(complete + '\n')
+    if pending:
+        yield _normalize_cv_text(pending)
+
+def _line_score(line: str, surname: str) -> int:
+    """How much a source line is worth keeping when the source must be shortened."""
+    score = 0
+    if _PUB_FIELD_LINE_RE.search(line):
+        score += 10
+    if _YEAR_RE.search(line):
+        score += 5
+    if surname and surname in line.lower():
+        score += 3
+    if _BOILERPLATE_LINE_RE.search(line):
+        score -= 20  # Below any content line, even a copyright footer carrying a year
+    return score
+
+def _line_blocks(lines: list) -> list:
+    """
+    Group lines into (start, end) blocks: a publication entry (its numbered/"Title:" line
+    plus the field lines under it) is one block, every other line is a block of its own.
+    """
+    blocks = []
+    start = 0
+    while start < len(lines):
+        end = start + 1
+        if _ENTRY_START_RE.match(lines[start]):
+            while (end < len(lines) and lines[end].strip() and not _ENTRY_START_RE.match(lines[end])
+                   and (_ENTRY_CONTINUATION_RE.match(lines[end]) or _PUB_FIELD_LINE_RE.search(lines[end]))):
+                end += 1
+        blocks.append((start, end))
+        start = end
+    return blocks
+
+def _select_lines(text: str, max_chars: int, surname: str) -> str:
+    """
+    Shorten `text` to about `max_chars` by keeping its highest-scoring blocks (publication
+    entries and lines with publication fields, years, the professor's surname) in their
+    original order, instead of cutting off the tail - which for publication lists is where
+    most of the entries are. A publication entry is kept or dropped as a whole, scored by
+    its best line, so a title never loses its Year/Authors lines.
+    """
+    lines = text.split('\n')
+    blocks = _line_blocks(lines)
+    scores = [max(_line_score(line, surname) for line in lines[start:end]) for start, end in blocks]
+    # sorted() is stable: equal scores keep document order
+    ranked = sorted(range(len(blocks)), key=lambda i: -scores[i])
+    keep, used = [], 0
+    for i in ranked:
+        start, end = blocks[i]
+        cost = sum(len(line) + 1 for line in lines[start:end])
+        if used + cost <= max_chars:
+            keep.append(i)
+            used += cost
+    if not keep:
+        return text[:max_chars]  # One oversized block: nothing to choose between
+    keep.sort()
+    return '\n'.join(line for i in keep for line in lines[blocks[i][0]:blocks[i][1]])
+
+def _professor_surname(professor_name: str) -> str:
+    """Lowercased last name word ("Dr. Ruki Harwahyu, S.T., M.T." → "harwahyu")."""
+    words = professor_name.split(',')[0].split()
+    return words[-1].lower() if words else ''
+
+def _estimate_tokens(text: str) -> int:
+    """Approximate token count (~4 chars/token), used when no tokenizer is available."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+def _allocate_token_budgets(token_counts: dict, total: int) -> dict:
+    """
+    Split `total` tokens across sources by SOURCE_BUDGET_SHARES. A source that needs
+    less than its share keeps only what it needs and the rest is re-divided among the
+    remaining sources, so short or missing sources don't waste prompt space.
+    """
+    budgets = {}
+    remaining = dict(token_counts)
+    left = total
+    while remaining:
+        share_sum = sum(SOURCE_BUDGET_SHARES[name] for name in remaining)
+        fits = {
+            name: count for name, count in remaining.items()
+            if count <= left * SOURCE_BUDGET_SHARES[name] / share_sum
+        }
+        if not fits:
+            for name in remaining:
+                budgets[name] = int(left * SOURCE_BUDGET_SHARES[name] / share_sum)
+            break
+        for name, count in fits.items():
+            budgets[name] = count
+            left -= count
+            del remaining[name]
+    return budgets
+
+def _tokenize_sources(texts: dict):
+    """
+    Real token ids per source via litellm's tokenizer (bundled tiktoken cl100k_base for
+    Gemini models - close enough for budgeting, and it counts Indonesian text and dense
+    metadata correctly where chars/4 doesn't). None if the tokenizer is unavailable.
+    """
     try:
-        ui_scholar_result = ui_scholar_search_tool._run(f"{professor_name} publications")
-        # Keep UI Scholar data - 2500 chars
-        collected_data['ui_scholar'] = clean_tool_output(ui_scholar_result, 2500)
-        print(f"  ✓ UI Scholar: {len(ui_scholar_result)} chars → {len(collected_data['ui_scholar'])} chars (cleaned)")
+        import litellm
+        
+        return {name: litellm.encode(model=CV_LLM_MODEL, text=text) for name, text in texts.items()}
     except Exception as e:
-        print(f"  ✗ UI Scholar error: {e}")
+        logger.debug("  Tokenizer unavailable (%r) - budgeting sources by character count", e)
+        return None
+
+def _shingles(line: str) -> set:
+    """Hashes of the line's overlapping SHINGLE_WORDS-word windows (case-insensitive)."""
+    words = line.lower().split()
+    return {hash(tuple(words[i:i + SHINGLE_WORDS])) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+def _dedupe_source_lines(collected_data: CollectedData) -> None:
+    """
+    Drop lines that repeat what a higher-priority source already said (the same
+    publication or bio sentence scraped from UI Scholar and Google Scholar, ...): a line
+    whose word shingles are mostly (> DUPLICATE_LINE_OVERLAP) covered by earlier sources
+    is removed. Lines shorter than one shingle ("Year: 2021") are always kept, and so are
+    author lines - different papers by the same group share them.
+    """
+    seen = set()
+    for name in _FIELD_PRIORITY:
+        text = getattr(collected_data, name)
+        if not text or _looks_like_tool_error(text):
+            continue
+        kept, dropped, source_shingles = [], 0, set()
+        for line in text.split('\n'):
+            shingles = _shingles(line)
+            if (shingles and not _AUTHOR_LINE_RE.match(line)
+                    and len(shingles & seen) > DUPLICATE_LINE_OVERLAP * len(shingles)):
+                dropped += 1
+                continue
+            source_shingles |= shingles
+            kept.append(line)
+        # Only compared against other sources: repeats within one source are left alone
+        seen |= source_shingles
+        if dropped:
+            setattr(collected_data, name, '\n'.join(kept))
+            logger.debug("  ✂️ %s: dropped %d lines already covered by other sources", name, dropped)
+
+def _truncate_to_tokens(text: str, max_tokens: int, use_tokenizer: bool) -> str:
+    """Hard cut at `max_tokens` (real tokens when the tokenizer is available), marked with '...'."""
+    if use_tokenizer:
+        import litellm
+        
+        ids = litellm.encode(model=CV_LLM_MODEL, text=text)
+        if len(ids) <= max_tokens:
+            return text
+        return litellm.decode(model=CV_LLM_MODEL, tokens=ids[:max_tokens]) + "..."
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    return text if len(text) <= max_chars else text[:max_chars] + "..."
+
+def _fit_sources_to_budget(collected_data: CollectedData, professor_name: str = '',
+                           total_tokens: int = SOURCE_TOKEN_BUDGET) -> None:
+    """
+    Shorten each collected source to its share of `total_tokens`, dropping its least
+    useful lines first (see _select_lines) and hard-truncating only what's left over.
+    """
+    texts = {name: getattr(collected_data, name) for name in collected_data.sources_used()}
+    tokens = _tokenize_sources(texts)
+    if tokens is not None:
+        token_counts = {name: len(ids) for name, ids in tokens.items()}
+    else:
+        token_counts = {name: _estimate_tokens(text) for name, text in texts.items()}
+    budgets = _allocate_token_budgets(token_counts, total_tokens)
+    surname = _professor_surname(professor_name)
+    for name, text in texts.items():
+        if token_counts[name] <= budgets[name]:
+            continue
+        # Scale the token budget to chars with this source's own chars/token ratio
+        text = _select_lines(text, len(text) * budgets[name] // token_counts[name], surname)
+        setattr(collected_data, name, _truncate_to_tokens(text, budgets[name], tokens is not None))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("  📏 Source token budget: %d → %s", total_tokens,
+                     ', '.join(f"{name}={budgets[name]}" for name in texts))
+
+def _build_compact_context(professor_name: str, collected_data: CollectedData, source_names=None) -> str:
+    """LLM context with one section per source (all sources, or only `source_names`) plus key info."""
+    # Key info as compact JSON with only the fields that were actually found
+    # (the prose "Field: Not available" lines cost tokens without adding information)
+    key_info = {k: v for k, v in collected_data.raw_info.items() if v}
+    key_info_json = json.dumps(key_info, ensure_ascii=False, separators=(',', ':')) if key_info else 'Not available'
     
-    print("\n[3/5] Collecting data from Google Scholar...")
-    try:
-        scholar_result = google_scholar_tool._run(professor_name)
-        # Keep MORE data from Scholar - increase from 1200 to 2500 chars
-        collected_data['scholar'] = clean_tool_output(scholar_result, 2500)
-        print(f"  ✓ Scholar: {len(scholar_result)} chars → {len(collected_data['scholar'])} chars (cleaned)")
-    except Exception as e:
-        print(f"  ✗ Scholar error: {e}")
+    parts = [f"DATA SOURCES FOR {professor_name}:", ""]
+    for name, heading, missing in _SOURCE_SECTIONS:
+        if source_names is None or name in source_names:
+            parts += [f"{heading}:", getattr(collected_data, name) or missing, ""]
+    parts += ["EXTRACTED KEY INFO (JSON):", key_info_json, ""]
+    
+    # Pre-extracted publications (already deduplicated across sources): the LLM formats these instead of hunting for them
+    candidates = [
+        candidate for candidate in collected_data.publication_candidates
+        if source_names is None or candidate['source'] in source_names
+    ]
+    # Dated entries first (stable sort keeps source priority), capped: the CV lists at most 15
+    candidates = sorted(candidates, key=lambda c: not c['year'])[:MAX_PROMPT_CANDIDATES]
+    if candidates:
+        parts += [
+            "PUBLICATION CANDIDATES (JSON, pre-extracted from the sources above - copy titles verbatim, "
+            "do not invent publications that appear in neither this list nor the sources):",
+            json.dumps(candidates, ensure_ascii=False, separators=(',', ':')),
+            ""
+        ]
+    return '\n'.join(parts)
+
+def _collect_source(name: str, tool, query: str, force_refresh: bool = False, extract_info: bool = False):
+    """
+    Run one data source and post-process its output in the worker thread.
+    Returns (raw_len, cleaned_text, key_info, publication_candidates).
+    """
+    raw = _cached_tool_run(tool, query, force_refresh=force_refresh)
+    if name == 'database':
+        cleaned, key_info = clean_and_extract(raw, _SOURCE_MAX_CHARS)
+        return len(raw), cleaned, key_info, []
+    if extract_info:
+        cleaned, key_info = clean_and_extract(raw, _SOURCE_MAX_CHARS)
+    else:
+        cleaned, key_info = clean_tool_output(raw, _SOURCE_MAX_CHARS), None
+    return len(raw), cleaned, key_info, extract_publication_candidates(raw, name)
+
+def _prepare_cv_prompt(professor_name: str, structured: bool = False, force_refresh: bool = False):
+    """
+    Collect data from all sources and build the CV prompt.
+    Returns (collected_data, prompt).
+    """
+    collected_data = _collect_cv_data(professor_name, force_refresh)
     
     # Step 4: Create compact context for LLM
-    print("\n[4/5] Generating CV with LLM...")
+    logger.debug("[4/5] Generating CV with LLM...")
     
-    compact_context = f"""DATA SOURCES FOR {professor_name}:
+    compact_context = _build_compact_context(professor_name, collected_data)
 
-🌐 ENG.UI.AC.ID OFFICIAL PERSONNEL PAGE (from eng.ui.ac.id - AUTHORITATIVE SOURCE):
-{collected_data['eng_ui_personnel'] if collected_data['eng_ui_personnel'] else 'Not available - will use fallback sources'}
+    # 🔥 USE NEW SIMPLIFIED PROMPT from cv_prompts.py
+    prompt = get_cv_generation_prompt(professor_name, compact_context, structured=structured)
+    return collected_data, prompt
 
-DATABASE INFORMATION (from RAG vector database):
-{collected_data['database'] or 'Not available'}
+def _collect_cv_data(professor_name: str, force_refresh: bool = False) -> CollectedData:
+    """Run all data sources for one professor and return the cleaned, budgeted results."""
+    from tools import (
+        academic_search_tool,
+        google_scholar_tool,
+        ui_scholar_search_tool,  # Add UI Scholar tool
+        eng_ui_personnel_scraper_tool  # NEW: Official eng.ui.ac.id personnel scraper
+    )
+    
+    collected_data = CollectedData()
+    
+    # Steps 0-3 are independent network calls: start them all at once so the
+    # collection phase costs max(latencies) instead of their sum. Each worker also
+    # cleans its own output, so parsing overlaps with the slower sources.
+    # Every source goes through the tool cache, so a retry after an LLM failure reuses fresh tool data
+    sources = {
+        'eng_ui_personnel': ("[0/5] 🌐 ENG.UI.AC.ID (official)", eng_ui_personnel_scraper_tool, professor_name),
+        'database': ("[1/5] Academic Database", academic_search_tool, professor_name),
+        'ui_scholar': ("[2/5] UI Scholar (scholar.ui.ac.id)", ui_scholar_search_tool, f"{professor_name} publications"),
+        'scholar': ("[3/5] Google Scholar", google_scholar_tool, professor_name),
+    }
+    # A cached official record already covers the database's authoritative fields: don't
+    # spend a database query (and wait on it) just to back it up - unless that's cached too
+    official_cached = not force_refresh and cv_cache.cache_get(
+        _tool_cache_key(eng_ui_personnel_scraper_tool, professor_name)) is not None
+    if official_cached and cv_cache.cache_get(_tool_cache_key(academic_search_tool, professor_name)) is None:
+        logger.debug("  ⏭️ ENG.UI.AC.ID record cached - skipping the Academic Database query")
+        del sources['database']
+    logger.debug("Collecting data from %d sources in parallel...", len(sources))
+    
+    executor = ThreadPoolExecutor(max_workers=len(sources))
+    futures = {
+        # Without the database, key info (name, birth, SINTA, ...) comes from the official page
+        executor.submit(
+            _collect_source, name, tool, query, force_refresh,
+            name == 'eng_ui_personnel' and 'database' not in sources
+        ): name
+        for name, (_, tool, query) in sources.items()
+    }
+    candidates = {}
+    try:
+        for future in as_completed(futures, timeout=TOOL_TIMEOUT):
+            name = futures[future]
+            label = sources[name][0]
+            try:
+                raw_len, cleaned, key_info, source_candidates = future.result()
+            except Exception as e:
+                logger.warning("  ✗ %s error: %r", label, e)
+                continue
+            setattr(collected_data, name, cleaned)
+            if key_info:
+                collected_data.raw_info.update(key_info)
+            candidates[name] = source_candidates
+            logger.debug("  ✓ %s: %d chars → %d chars (cleaned)", label, raw_len, len(cleaned))
+    except FuturesTimeoutError:
+        pending = [sources[name][0] for future, name in futures.items() if not future.done()]
+        logger.warning("  ✗ Timed out after %ds waiting for: %s", TOOL_TIMEOUT, ", ".join(pending))
+    finally:
+        # Don't block on tools that exceeded TOOL_TIMEOUT; their results are discarded
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    # Completion order varies between runs; keep the candidate list (and so the
+    # prompt and its LLM cache key) in a fixed source order
+    collected_data.publication_candidates = dedupe_publications(
+        [candidate for name in sources for candidate in candidates.get(name, [])]
+    )
+    
+    _dedupe_source_lines(collected_data)
+    _fit_sources_to_budget(collected_data, professor_name)
+    return collected_data
 
-UI SCHOLAR PUBLICATIONS (from scholar.ui.ac.id - PRIMARY SOURCE for UI faculty):
-{collected_data['ui_scholar'] if collected_data['ui_scholar'] else 'Not available'}
+def _build_fallback_cv(professor_name: str, raw_info: dict) -> str:
+    """Basic markdown CV from the extracted key info, used when the LLM call fails."""
+    parts = [
+        f"# {raw_info.get('name', professor_name)}",
+        "",
+        "## PERSONAL INFORMATION",
+        "- Position: Professor",
+        "- Affiliation: Universitas Indonesia",
+        f"- Born: {raw_info.get('birth', 'Not available')}",
+        "",
+        "## RESEARCH INTERESTS",
+    ]
+    parts.extend('- ' + area for area in raw_info.get('research_areas') or ['Not available'])
+    parts += [
+        "",
+        "## ACADEMIC METRICS",
+        f"- SINTA Score: {raw_info.get('sinta_score', 'Not available')}",
+        "",
+        "## EXTERNAL PROFILES",
+        "- SINTA: https://sinta.kemdiktisaintek.go.id/authors/profile/5977168",
+        "",
+        "---",
+        "*Note: This CV was automatically generated with limited data. For complete information, please visit the official profiles above.*",
+        "",
+    ]
+    return '\n'.join(parts)
 
-GOOGLE SCHOLAR PUBLICATIONS (from Google Scholar API):
-{collected_data['scholar'] if collected_data['scholar'] else 'Not available'}
+def _template_publications(candidates: list) -> list:
+    """Dated candidates (already deduplicated, best source first), capped for the CV."""
+    return [candidate for candidate in candidates if candidate['year']][:CV_TEMPLATE_MAX_PUBLICATIONS]
 
-EXTRACTED KEY INFO:
-Name: {collected_data['raw_info'].get('name', professor_name)}
-Birth: {collected_data['raw_info'].get('birth', 'Not available')}
-SINTA Score: {collected_data['raw_info'].get('sinta_score', 'Not available')}
-Research Areas: {', '.join(collected_data['raw_info'].get('research_areas', [])) or 'Not available'}
-"""
+def _template_header_name(professor_name: str, raw_info: dict) -> str:
+    """
+    The extracted name when it is a titled match for this professor ("Prof. Dr. Ir. ..."
+    containing their surname), else the requested name - the untitled fallback pattern
+    takes any capitalized words, e.g. "Teknik Elektro".
+    """
+    name = raw_info.get('name') or ''
+    surname = professor_name.split()[-1].lower() if professor_name.split() else ''
+    if _TITLED_NAME_RE.match(name) and surname and surname in name.lower():
+        return name
+    return professor_name
 
-    # 🔥 USE NEW SIMPLIFIED PROMPT from cv_prompts.py
-    prompt = get_cv_generation_prompt(professor_name, compact_context)
+def _build_template_cv(professor_name: str, raw_info: dict, publications: list) -> str:
+    """Markdown CV filled directly from the extracted fields, in the CV_TEMPLATE layout."""
+    parts = [
+        f"# {_template_header_name(professor_name, raw_info)}",
+        "",
+        "## PERSONAL INFORMATION",
+        "- Affiliation: Universitas Indonesia",
+        "- Department: Departemen Teknik Elektro",
+    ]
+    if raw_info.get('birth'):
+        parts.append(f"- Born: {raw_info['birth']}")
+    if raw_info.get('sinta_score'):
+        parts.append(f"- SINTA Score: {raw_info['sinta_score']}")
+    if raw_info.get('research_areas'):
+        parts += ["", "## RESEARCH INTERESTS"]
+        parts.extend('- ' + area for area in raw_info['research_areas'])
+    parts += ["", "## SELECTED PUBLICATIONS"]
+    for i, pub in enumerate(publications, 1):
+        parts += [
+            "",
+            f"{i}. **{pub['title']}**",
+            f"   - Year: {pub['year']}",
+            f"   - Source: {_SOURCE_LABELS[pub['source']]}",
+        ]
+    parts.append("")
+    return '\n'.join(parts)
+
+def _cv_generation_mode() -> str:
+    return "map_reduce" if CV_MAP_REDUCE else "structured" if CV_STRUCTURED_OUTPUT else "markdown"
+
+def _cv_result_cache_key(professor_name: str, mode: str = None) -> str:
+    # PROMPT_VERSION + generation mode in the key: a template or mode change never serves a stale CV
+    mode = mode or _cv_generation_mode()
+    from eng_ui_scraper import normalize_professor_name
+    
+    # Titles/degrees ignored: "Dr. Mia Rizkinia" and "Mia Rizkinia" share one cached CV
+    name_hash = hashlib.sha1(normalize_professor_name(professor_name).encode()).hexdigest()
+    return f"cv_result:{PROMPT_VERSION}:{mode}:{name_hash}"
+
+def _no_data_result(professor_name: str, raw_info: dict, warning: str = "No data found in any source") -> dict:
+    """Fallback CV result for a professor none of the sources returned usable data for."""
+    fallback_cv = _build_fallback_cv(professor_name, raw_info)
+    return {
+        "success": True,
+        "professor_name": professor_name,
+        "cv_text": fallback_cv,
+        "metadata": {
+            "generated_by": "Fallback Generator (no source data)",
+            "character_count": len(fallback_cv),
+            "warning": warning
+        }
+    }
+
+def _cached_cv_result(professor_name: str, force_refresh: bool = False):
+    """The cached CV for this professor (same prompt version and mode), or None."""
+    if force_refresh:
+        return None
+    cached_result = cv_cache.cache_get(_cv_result_cache_key(professor_name))
+    if cached_result:
+        logger.info("  ✓ CV cache hit for '%s' (%d chars)", professor_name, cached_result['metadata']['character_count'])
+        cached_result['metadata']['cached'] = True
+        cached_result['professor_name'] = professor_name
+    return cached_result
+
+def _template_cv_result(professor_name: str, collected_data: CollectedData):
+    """
+    Rich structured data: a deterministic fill is as good as the LLM and costs nothing.
+    Returns the (cached) template CV result, or None when the data isn't rich enough.
+    """
+    publications = _template_publications(collected_data.publication_candidates)
+    raw_info = collected_data.raw_info
+    if len(publications) < CV_TEMPLATE_MIN_PUBLICATIONS or not raw_info.get('name') or not raw_info.get('birth'):
+        return None
+    
+    cv_text = _build_template_cv(professor_name, raw_info, publications)
+    logger.info("  ✓ %d publications + key info extracted - filled CV template without LLM", len(publications))
+    result = {
+        "success": True,
+        "professor_name": professor_name,
+        "cv_text": cv_text,
+        "metadata": {
+            "generated_by": "Template (no LLM)",
+            "character_count": len(cv_text),
+            "sources_used": collected_data.sources_used()
+        }
+    }
+    cv_cache.cache_set(_cv_result_cache_key(professor_name), result, ttl=CV_RESULT_CACHE_TTL)
+    return result
+
+def _llm_cache_key(prompt: str, variant: str = "") -> str:
+    prefix = f"cv_llm:{variant}:" if variant else "cv_llm:"
+    return prefix + hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+
+def _generate_cv_map_reduce(professor_name: str, collected_data: CollectedData) -> str:
+    """
+    Map: one structured LLM call per usable source, in parallel, each seeing only that
+    source (smaller contexts, no cross-source mixing). Reduce: merge the per-source
+    CVModels deterministically in Python and render the markdown.
+    """
+    from cv_schema import CVModel, merge_cvs, render_cv_markdown
+    
+    sources = [
+        name for name in collected_data.sources_used()
+        if not _looks_like_tool_error(getattr(collected_data, name))
+    ]
+    logger.info("  🗺️ Map-reduce generation over %d sources: %s", len(sources), ', '.join(sources))
+    
+    extract_overrides = (
+        {"model": CV_EXTRACT_MODEL, "max_tokens": CV_EXTRACT_MAX_TOKENS} if CV_EXTRACT_MODEL else {}
+    )
+    
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        futures = {
+            name: executor.submit(
+                _call_llm,
+                get_cv_generation_prompt(
+                    professor_name,
+                    _build_compact_context(professor_name, collected_data, (name,)),
+                    structured=True
+                ),
+                CVModel,
+                **extract_overrides
+            )
+            for name in sources
+        }
+    
+    partial_cvs = {}
+    for name, future in futures.items():
+        try:
+            partial_cvs[name] = CVModel.model_validate_json(future.result())
+            logger.debug("  ✓ %s: %d publications", name, len(partial_cvs[name].publications))
+        except Exception as e:
+            logger.warning("  ✗ %s: extraction failed: %r", name, e)
+    
+    if not partial_cvs:
+        raise ValueError("All per-source LLM calls failed")
+    
+    merged = merge_cvs(partial_cvs, _FIELD_PRIORITY, _PUBLICATION_PRIORITY)
+    return render_cv_markdown(merged)
+
+def _reduced_cv_prompt(professor_name: str, collected_data: CollectedData, structured: bool = CV_STRUCTURED_OUTPUT) -> str:
+    """Rebuild the CV prompt with half the source token budget (lowest-value lines go first)."""
+    _fit_sources_to_budget(collected_data, professor_name, SOURCE_TOKEN_BUDGET // 2)
+    return get_cv_generation_prompt(
+        professor_name, _build_compact_context(professor_name, collected_data), structured=structured
+    )
+
+def _fallback_cv_text(professor_name: str, collected_data: CollectedData) -> str:
+    """CV used when the LLM fails: the template fill with whatever publications were found."""
+    publications = _template_publications(collected_data.publication_candidates)
+    if publications:
+        return _build_template_cv(professor_name, collected_data.raw_info, publications)
+    return _build_fallback_cv(professor_name, collected_data.raw_info)
+
+def _count_publications(cv_text: str) -> int:
+    """
+    Number of `N. **Title**` entries in the CV's publications section (the layout of
+    CV_TEMPLATE, render_cv_markdown and _build_template_cv); 0 if there's no such section.
+    """
+    header = _PUBLICATIONS_HEADER_RE.search(cv_text)
+    if not header:
+        return 0
+    next_section = _SECTION_HEADER_RE.search(cv_text, header.end())
+    section_end = next_section.start() if next_section else len(cv_text)
+    return len(_NUMBERED_PUB_RE.findall(cv_text, header.end(), section_end))
+
+def _generate_cv_text(prompt: str, deadline: float = None, **overrides) -> str:
+    """One LLM generation of the CV markdown (structured or streamed, per CV_STRUCTURED_OUTPUT)."""
+    if CV_STRUCTURED_OUTPUT:
+        from cv_schema import CVModel, render_cv_markdown
+        
+        response = _call_llm(prompt, response_format=CVModel, deadline=deadline, **overrides)
+        return render_cv_markdown(CVModel.model_validate_json(response))
+    # Streamed even here so generation stops at the natural end of the CV
+    # str.strip() hands back the same object when there's nothing to trim, so this
+    # only copies the text if the model actually emitted leading/trailing whitespace
+    return _with_llm_retries(
+        lambda: ''.join(_stream_cv_markdown(prompt, deadline, **overrides)), deadline
+    ).strip()
+
+def _generate_cv_tiered(prompt: str, deadline: float = None):
+    """
+    Draft with CV_DRAFT_MODEL, escalating to the main model only when the draft
+    errors, is empty, or has too few publications. Returns (cv_text, model_used).
+    """
+    main_model = CV_LLM_MODEL
+    if CV_DRAFT_MODEL and CV_DRAFT_MODEL != main_model:
+        try:
+            cv_text = _generate_cv_text(prompt, deadline, model=CV_DRAFT_MODEL)
+            publication_count = _count_publications(cv_text)
+            if len(cv_text) >= 100 and publication_count >= CV_MIN_PUBLICATIONS:
+                return cv_text, CV_DRAFT_MODEL
+            logger.info("  ↗️ Draft from %s has %d publications (%d chars) - regenerating with %s",
+                        CV_DRAFT_MODEL, publication_count, len(cv_text), main_model)
+        except Exception as e:
+            logger.warning("  ↗️ Draft model %s failed (%r) - regenerating with %s", CV_DRAFT_MODEL, e, main_model)
+    return _generate_cv_text(prompt, deadline), main_model
+
+def simplified_cv_generation(professor_name: str, session_id: str = None, force_refresh: bool = False) -> dict:
+    """
+    Simplified CV generation that avoids LLM context overflow.
+    Direct tool usage with pre-processed outputs.
+    force_refresh=True ignores every cache (CV, tool outputs, LLM) and regenerates.
+    """
+    
+    logger.info("🤖 SIMPLIFIED CV GENERATION FOR: %s", professor_name)
+    
+    # Same professor requested again → skip tools and LLM entirely
+    cached_result = _cached_cv_result(professor_name, force_refresh)
+    if cached_result:
+        return cached_result
+    result_cache_key = _cv_result_cache_key(professor_name)
+    
+    collected_data, prompt = _prepare_cv_prompt(
+        professor_name, structured=CV_STRUCTURED_OUTPUT, force_refresh=force_refresh
+    )
+    
+    # Every source failed: the LLM would only be asked to invent a CV from nothing
+    if not collected_data.has_source_data():
+        logger.warning("  ⚠️ No usable data from any source - skipping LLM, using fallback CV")
+        return _no_data_result(professor_name, collected_data.raw_info)
+    
+    template_result = _template_cv_result(professor_name, collected_data)
+    if template_result:
+        return template_result
+    
+    # Same prompt (identical source data + template) → reuse the CV generated last time
+    llm_cache_key = _llm_cache_key(prompt, "map_reduce" if CV_MAP_REDUCE else "")
+    cached_cv_text = None if force_refresh else cv_cache.cache_get(llm_cache_key)
+    if cached_cv_text:
+        logger.info("  ✓ LLM cache hit: reusing CV generated from identical source data (%d chars)", len(cached_cv_text))
+        return {
+            "success": True,
+            "professor_name": professor_name,
+            "cv_text": cached_cv_text,
+            "metadata": {
+                "generated_by": "Simplified CV Generator (cached)",
+                "character_count": len(cached_cv_text),
+                "sources_used": collected_data.sources_used(),
+                "cached": True
+            }
+        }
 
     try:
-        response = llm.call([{"role": "user", "content": prompt}])
-        cv_text = str(response).strip()
+        if CV_MAP_REDUCE:
+            cv_text = _generate_cv_map_reduce(professor_name, collected_data)
+            model_used = CV_EXTRACT_MODEL or CV_LLM_MODEL
+        else:
+            deadline = time.monotonic() + CV_LLM_DEADLINE
+            try:
+                cv_text, model_used = _generate_cv_tiered(prompt, deadline)
+            except Exception as e:
+                # Timeouts/overloads/context errors: one retry with half the source text
+                # still beats the near-empty fallback CV (anything else, or a spent
+                # deadline, goes straight to the fallback)
+                if not _is_retryable_llm_error(e) or deadline - time.monotonic() <= 0:
+                    raise
+                logger.warning("  ↻ CV generation failed (%r) - retrying once with a reduced context", e)
+                cv_text = _generate_cv_text(_reduced_cv_prompt(professor_name, collected_data), deadline)
+                model_used = CV_LLM_MODEL
         
         # Validate response LENGTH (should be at least 5000 chars for 10+ publications)
         if not cv_text or len(cv_text) < 100:
             raise ValueError("LLM returned insufficient content")
         
         # 🚨 CRITICAL VALIDATION: Check publication count
-        publication_count = cv_text.lower().count('\n- **') + cv_text.lower().count('\n1. **') + cv_text.lower().count('\n2. **')
-        if publication_count < 8:
-            print(f"  ⚠️ WARNING: Only {publication_count} publications found in output (expected 10+)")
-            print(f"  ⚠️ LLM output length: {len(cv_text)} chars (should be 5000+ for complete CV)")
+        publication_count = _count_publications(cv_text)
+        if publication_count < CV_MIN_PUBLICATIONS:
+            logger.warning("  ⚠️ Only %d publications found in output (expected %d+); LLM output length: %d chars",
+                           publication_count, CV_MIN_PUBLICATIONS, len(cv_text))
         
         # 🚨 CRITICAL FIX: Convert [at] notation to @ BEFORE returning to PDF generator
-        cv_text = cv_text.replace('[at]', '@').replace('[ at ]', '@').replace(' [at] ', '@')
-        print(f"  ✓ Email [at] notation converted to @ symbol")
+        cv_text = _normalize_cv_text(cv_text)
         
-        print(f"  ✓ CV generated: {len(cv_text)} characters")
+        logger.info("  ✓ CV generated by %s: %d characters", model_used, len(cv_text))
+        cv_cache.cache_set(llm_cache_key, cv_text, ttl=LLM_CACHE_TTL)
         
-        # DEBUG: Print first 500 chars to see actual format
-        print("\n" + "="*80)
-        print("[DEBUG] CV TEXT PREVIEW (first 500 chars):")
-        print("="*80)
-        print(cv_text[:500])
-        print("="*80 + "\n")
+        # DEBUG: Preview of the first 500 chars to see actual format (slice only taken at DEBUG level)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DEBUG] CV TEXT PREVIEW (first 500 chars):\n%s", cv_text[:500])
         
-        return {
+        result = {
             "success": True,
             "professor_name": professor_name,
             "cv_text": cv_text,
             "metadata": {
-                "generated_by": "Simplified CV Generator",
+                "generated_by": f"Simplified CV Generator ({model_used})",
                 "character_count": len(cv_text),
-                "sources_used": [k for k, v in collected_data.items() if v and k != 'raw_info']
+                "sources_used": collected_data.sources_used()
             }
         }
+        cv_cache.cache_set(result_cache_key, result, ttl=CV_RESULT_CACHE_TTL)
+        return result
         
     except Exception as e:
-        print(f"  ✗ LLM error: {e}")
+        logger.warning("  ✗ LLM error: %s", e)
         
-        # Fallback: Create basic CV from extracted data
-        fallback_cv = f"""# {collected_data['raw_info'].get('name', professor_name)}
-
-## PERSONAL INFORMATION
-- Position: Professor
-- Affiliation: Universitas Indonesia
-- Born: {collected_data['raw_info'].get('birth', 'Not available')}
-
-## RESEARCH INTERESTS
-{chr(10).join(['- ' + area for area in collected_data['raw_info'].get('research_areas', ['Not available'])])}
-
-## ACADEMIC METRICS
-- SINTA Score: {collected_data['raw_info'].get('sinta_score', 'Not available')}
-
-## EXTERNAL PROFILES
-- SINTA: https://sinta.kemdiktisaintek.go.id/authors/profile/5977168
-
----
-*Note: This CV was automatically generated with limited data. For complete information, please visit the official profiles above.*
-"""
+        # Fallback: Create basic CV from extracted data (with whatever publications were found)
+        fallback_cv = _fallback_cv_text(professor_name, collected_data)
         
         return {
             "success": True,
@@ -238,12 +1167,263 @@ Research Areas: {', '.join(collected_data['raw_info'].get('research_areas', []))
             }
         }
 
-def generate_cv_with_agents(professor_name: str, session_id: str = None) -> dict:
+# Yielded by simplified_cv_generation_stream when the LLM fails after part of the CV was
+# already sent: the caller should discard that text, the fallback CV follows
+STREAM_RESET = object()
+
+def simplified_cv_generation_stream(professor_name: str, force_refresh: bool = False):
+    """
+    Streaming variant of simplified_cv_generation.
+    
+    Yields the CV markdown line by line while the LLM is still generating, so a
+    caller (e.g. a Server-Sent Events endpoint) can show the first sections
+    immediately instead of waiting for the full response. Lines are emitted whole
+    so the [at] → @ conversion never sees a split token.
+    
+    Shares the result cache, template fill, reduced-context retry and fallback CV with
+    simplified_cv_generation. The CV is always streamed from the main model in
+    markdown: a draft can't be escalated once the user has seen it.
+    """
+    logger.info("🤖 STREAMING CV GENERATION FOR: %s", professor_name)
+    
+    cached_result = _cached_cv_result(professor_name, force_refresh)
+    if cached_result:
+        yield cached_result['cv_text']
+        return
+    
+    collected_data, prompt = _prepare_cv_prompt(professor_name, force_refresh=force_refresh)
+    
+    if not collected_data.has_source_data():
+        logger.warning("  ⚠️ No usable data from any source - skipping LLM, using fallback CV")
+        yield _build_fallback_cv(professor_name, collected_data.raw_info)
+        return
+    
+    template_result = _template_cv_result(professor_name, collected_data)
+    if template_result:
+        yield template_result['cv_text']
+        return
+    
+    llm_cache_key = _llm_cache_key(prompt)
+    cached_cv_text = None if force_refresh else cv_cache.cache_get(llm_cache_key)
+    if cached_cv_text:
+        logger.info("  ✓ LLM cache hit: reusing CV generated from identical source data (%d chars)", len(cached_cv_text))
+        yield cached_cv_text
+        return
+    
+    deadline = time.monotonic() + CV_LLM_DEADLINE
+    parts = []
+    try:
+        try:
+            for block in _stream_cv_markdown(prompt, deadline):
+                parts.append(block)
+                yield block
+        except Exception as e:
+            # Same reduced-context retry as simplified_cv_generation, while nothing was sent yet
+            if parts or not _is_retryable_llm_error(e) or deadline - time.monotonic() <= 0:
+                raise
+            logger.warning("  ↻ CV generation failed (%r) - retrying once with a reduced context", e)
+            reduced_prompt = _reduced_cv_prompt(professor_name, collected_data, structured=False)
+            for block in _stream_cv_markdown(reduced_prompt, deadline):
+                parts.append(block)
+                yield block
+    except Exception as e:
+        logger.warning("  ✗ LLM error: %s", e)
+        if parts:
+            yield STREAM_RESET
+        yield _fallback_cv_text(professor_name, collected_data)
+        return
+    
+    cv_text = ''.join(parts).strip()
+    if len(cv_text) < 100:
+        # Same outcome as the JSON path's "insufficient content": replace it with the fallback
+        logger.warning("  ✗ LLM returned insufficient content (%d chars) - using fallback CV", len(cv_text))
+        if parts:
+            yield STREAM_RESET
+        yield _fallback_cv_text(professor_name, collected_data)
+        return
+    logger.info("  ✓ CV streamed: %d characters", len(cv_text))
+    cv_cache.cache_set(llm_cache_key, cv_text, ttl=LLM_CACHE_TTL)
+    
+    # Served to the non-streaming endpoint too, when it generates markdown the same way
+    if _cv_generation_mode() == "markdown" and _count_publications(cv_text) >= CV_MIN_PUBLICATIONS:
+        result = {
+            "success": True,
+            "professor_name": professor_name,
+            "cv_text": cv_text,
+            "metadata": {
+                "generated_by": f"Simplified CV Generator ({CV_LLM_MODEL}, streamed)",
+                "character_count": len(cv_text),
+                "sources_used": collected_data.sources_used()
+            }
+        }
+        cv_cache.cache_set(_cv_result_cache_key(professor_name), result, ttl=CV_RESULT_CACHE_TTL)
+
+def generate_cv_with_agents(professor_name: str, session_id: str = None, force_refresh: bool = False) -> dict:
     """
     Main CV generation function - now uses simplified approach to avoid LLM failures.
     """
-    print(f"\n[CV GENERATOR] Using simplified generation approach for: {professor_name}")
-    return simplified_cv_generation(professor_name, session_id)
+    logger.debug("[CV GENERATOR] Using simplified generation approach for: %s", professor_name)
+    return simplified_cv_generation(professor_name, session_id, force_refresh=force_refresh)
+
+async def simplified_cv_generation_async(professor_name: str, session_id: str = None, force_refresh: bool = False) -> dict:
+    """
+    Awaitable simplified_cv_generation for async callers (FastAPI endpoints, batches).
+    
+    The tools are blocking `requests` calls that already fan out on their own thread
+    pool, so the whole pipeline runs in one worker thread and the event loop stays free
+    for other requests while the CV is generated.
+    """
+    return await asyncio.to_thread(simplified_cv_generation, professor_name, session_id, force_refresh)
+
+def _generate_cv_batch(professor_names: list, collected: dict) -> dict:
+    """
+    One LLM call for a group of professors; returns {professor_name: result} for every
+    CV the answer actually contains (anyone missing is left to the caller).
+    """
+    prompt = get_cv_batch_prompt([
+        (name, _build_compact_context(name, collected[name])) for name in professor_names
+    ])
+    response = _call_llm(
+        prompt,
+        max_tokens=CV_LLM_MAX_TOKENS * len(professor_names),
+        timeout=LLM_TIMEOUT * len(professor_names)
+    )
+    
+    results = {}
+    for index, cv_text in _split_batch_cvs(response, len(professor_names)).items():
+        name = professor_names[index]
+        cv_text = _normalize_cv_text(cv_text)
+        # A section cut off by the shared max_tokens (or otherwise thin) is never cached;
+        # the caller regenerates that professor on their own
+        publication_count = _count_publications(cv_text)
+        if len(cv_text) < 100 or publication_count < CV_MIN_PUBLICATIONS:
+            logger.info("[CV BATCH] CV[%d] for '%s' has %d publications (%d chars) - rejected",
+                        index + 1, name, publication_count, len(cv_text))
+            continue
+        result = {
+            "success": True,
+            "professor_name": name,
+            "cv_text": cv_text,
+            "metadata": {
+                "generated_by": f"Simplified CV Generator (batch of {len(professor_names)}, {CV_LLM_MODEL})",
+                "character_count": len(cv_text),
+                "sources_used": collected[name].sources_used()
+            }
+        }
+        cv_cache.cache_set(_cv_result_cache_key(name, mode="markdown"), result, ttl=CV_RESULT_CACHE_TTL)
+        results[name] = result
+    return results
+
+def _split_batch_cvs(response: str, count: int) -> dict:
+    """
+    Split a batch answer on its "### CV[n]" marker lines into {0-based index: cv_text}.
+    Numbers outside 1..count are ignored, and a repeated number keeps its first section.
+    """
+    # split() with a capture group → [preamble, "1", cv_1, "2", cv_2, ...]
+    sections = _BATCH_CV_MARKER_RE.split(response or '')
+    cvs = {}
+    for number, cv_text in zip(sections[1::2], sections[2::2]):
+        index = int(number) - 1
+        if 0 <= index < count and index not in cvs:
+            cvs[index] = cv_text.strip()
+    return cvs
+
+def simplified_cv_generation_batch(professor_names: list, batch_size: int = CV_BATCH_SIZE) -> list:
+    """
+    Generate CVs for many professors with one LLM call per `batch_size` of them (batch
+    prompting: the group shares a single copy of the static instructions).
+    
+    Data collection still runs per professor, in parallel. Cached CVs come from the
+    cache, rich data gets the template fill and professors without source data (or whose
+    collection failed) get the fallback CV, as in simplified_cv_generation. Professors
+    whose CV is missing or incomplete in the batch answer go through
+    simplified_cv_generation on their own. Results follow the order of `professor_names`.
+    
+    The batch prompt only produces markdown: with CV_STRUCTURED_OUTPUT or CV_MAP_REDUCE
+    every professor is generated individually.
+    """
+    if _cv_generation_mode() != "markdown":
+        return [simplified_cv_generation(name) for name in professor_names]
+    
+    results = {}
+    pending = []
+    for name in dict.fromkeys(professor_names):
+        cached_result = _cached_cv_result(name)
+        if cached_result:
+            results[name] = cached_result
+        else:
+            pending.append(name)
+    
+    logger.info("[CV BATCH] %d cached, collecting data for %d professors", len(results), len(pending))
+    collected = {}
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(len(pending), 8)) as executor:
+            futures = {name: executor.submit(_collect_cv_data, name) for name in pending}
+        for name, future in futures.items():
+            # One professor's collection error must not abort the whole batch
+            try:
+                collected[name] = future.result()
+            except Exception as e:
+                logger.warning("[CV BATCH] ✗ Data collection for '%s' failed (%r) - using fallback CV", name, e)
+                results[name] = _no_data_result(name, {}, warning=f"Data collection failed: {e}")
+    
+    batchable = []
+    for name, collected_data in collected.items():
+        # Nothing to gain from simplified_cv_generation: it would rerun the same failing tools
+        if not collected_data.has_source_data():
+            results[name] = _no_data_result(name, collected_data.raw_info)
+            continue
+        template_result = _template_cv_result(name, collected_data)
+        if template_result:
+            results[name] = template_result
+        else:
+            batchable.append(name)
+    for start in range(0, len(batchable), batch_size):
+        group = batchable[start:start + batch_size]
+        try:
+            generated = _generate_cv_batch(group, collected)
+            logger.info("[CV BATCH] ✓ %d/%d CVs from one LLM call", len(generated), len(group))
+            results.update(generated)
+        except Exception as e:
+            logger.warning("[CV BATCH] ✗ Batch of %d failed (%r) - generating individually", len(group), e)
+    
+    for name in professor_names:
+        if name not in results:
+            results[name] = simplified_cv_generation(name)
+    return [results[name] for name in professor_names]
+
+def _bounded_cv_generation(concurrency: int):
+    """Awaitable per-professor generator that lets at most `concurrency` CVs run at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def _generate_one(professor_name: str) -> dict:
+        async with semaphore:
+            return await simplified_cv_generation_async(professor_name)
+    
+    return _generate_one
+
+async def generate_cvs_batch(professor_names: list, concurrency: int = 8) -> list:
+    """
+    Generate CVs for many professors concurrently.
+    
+    Each CV runs the normal simplified pipeline in a worker thread; at most
+    `concurrency` CVs (and therefore LLM requests) are in flight at once.
+    Results are returned in the same order as `professor_names`.
+    """
+    generate_one = _bounded_cv_generation(concurrency)
+    logger.info("[CV BATCH] Generating %d CVs (concurrency=%d)", len(professor_names), concurrency)
+    return await asyncio.gather(*(generate_one(name) for name in professor_names))
+
+async def iter_cvs_batch(professor_names: list, concurrency: int = 8):
+    """
+    Like generate_cvs_batch, but yields each result as soon as its CV is done
+    (completion order - use result["professor_name"]), so a caller can stream
+    finished CVs instead of waiting for the slowest one.
+    """
+    generate_one = _bounded_cv_generation(concurrency)
+    logger.info("[CV BATCH] Streaming %d CVs (concurrency=%d)", len(professor_names), concurrency)
+    for next_result in asyncio.as_completed([generate_one(name) for name in professor_names]):
+        yield await next_result
 
 def quick_cv_generation(professor_name: str) -> str:
     """
@@ -252,6 +1432,6 @@ def quick_cv_generation(professor_name: str) -> str:
     """
     from tools import cv_generator_tool
     
-    print(f"\n[QUICK CV] Generating CV for: {professor_name}")
+    logger.info("[QUICK CV] Generating CV for: %s", professor_name)
     result = cv_generator_tool._run(professor_name)
     return result
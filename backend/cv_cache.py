@@ -0,0 +1,89 @@
+"""
+Persistent cache for CV generation
+SQLite-backed key/value store (stdlib only) so cached tool and LLM outputs survive restarts
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+CACHE_PATH = os.getenv(
+    "CV_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cv_cache.sqlite3")
+)
+
+# Child of cv_agent's logger, so records go through its queue handler
+logger = logging.getLogger("cv_agent.cache")
+
+# Expired rows are deleted on read, and in bulk at most this often (checked on write)
+PURGE_INTERVAL = 60 * 60
+
+_lock = threading.Lock()
+_conn = None
+_last_purge = 0.0
+
+def _get_conn() -> sqlite3.Connection:
+    """Open the cache database once and share the connection (guarded by _lock)."""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        _conn.commit()
+    return _conn
+
+def cache_get(key: str):
+    """Return the cached value for `key`, or None if missing/expired/unreadable."""
+    try:
+        with _lock:
+            row = _get_conn().execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning("[CV_CACHE] ⚠️ Read failed for %s: %s", key, e)
+        return None
+
+    if row is None:
+        return None
+
+    value, expires_at = row
+    if expires_at is not None and expires_at < time.time():
+        _delete_expired(key)
+        return None
+    return json.loads(value)
+
+def cache_set(key: str, value, ttl: float = None) -> None:
+    """Store a JSON-serializable value under `key`, optionally expiring after `ttl` seconds."""
+    global _last_purge
+    now = time.time()
+    expires_at = now + ttl if ttl else None
+    try:
+        with _lock:
+            conn = _get_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at)
+            )
+            if now - _last_purge >= PURGE_INTERVAL:
+                _last_purge = now
+                purged = conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,)).rowcount
+                if purged:
+                    logger.debug("[CV_CACHE] Purged %d expired entries", purged)
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.warning("[CV_CACHE] ⚠️ Write failed for %s: %s", key, e)
+
+def _delete_expired(key: str) -> None:
+    """Drop `key` if it has expired (re-checked, in case it was just rewritten)."""
+    try:
+        with _lock:
+            conn = _get_conn()
+            conn.execute("DELETE FROM cache WHERE key = ? AND expires_at < ?", (key, time.time()))
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.warning("[CV_CACHE] ⚠️ Delete failed for %s: %s", key, e)
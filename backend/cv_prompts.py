@@ -3,174 +3,85 @@ SIMPLIFIED CV GENERATION PROMPTS
 Separated from cv_agent.py for clarity and maintainability
 """
 
-def get_cv_generation_prompt(professor_name: str, compact_context: str) -> str:
+import os
+import hashlib
+
+# Static prompt text lives in prompts/ (like the PDF templates in templates/) so it can be
+# edited - or swapped per deployment via CV_PROMPT_DIR - without touching the code; it is
+# read once at import and PROMPT_VERSION below picks up any change
+PROMPT_DIR = os.getenv("CV_PROMPT_DIR", os.path.join(os.path.dirname(__file__), 'prompts'))
+
+def _load_prompt(filename: str) -> str:
+    with open(os.path.join(PROMPT_DIR, filename), encoding='utf-8') as f:
+        return f.read().rstrip('\n')
+
+# Markdown skeleton the model fills in; pdf_generator.parse_markdown_cv() relies on
+# the "# Name" / "## SECTION" headers and the numbered "N. **Title**" publication lines
+CV_TEMPLATE = _load_prompt('cv_template.md')
+
+# Everything that is identical across professors comes first, so every request shares
+# one byte-identical prefix the provider can serve from its prompt cache; only the
+# name and source data at the end change per call
+STATIC_PREFIX = _load_prompt('cv_instructions.md') + "\n\n" + CV_TEMPLATE
+
+# Added to the static prefix when the LLM returns JSON against cv_schema.CVModel instead of markdown
+_STRUCTURED_OUTPUT_INSTRUCTION = """
+
+Response format: instead of markdown, return one JSON object matching the provided schema, applying the rules above to its fields."""
+
+_STATIC_PREFIX_STRUCTURED = STATIC_PREFIX + _STRUCTURED_OUTPUT_INSTRUCTION
+
+_DYNAMIC_SUFFIX_TEMPLATE = """
+
+Professor: {professor_name}
+Header line: # DR. ENG. {professor_name_upper}
+
+<data>
+{compact_context}
+</data>"""
+
+# Split once at import: per call the prompt is a plain join of constants and the dynamic
+# fields, with no .format() pass over the static instructions (or the source text)
+_SUFFIX_NAME, _SUFFIX_REST = _DYNAMIC_SUFFIX_TEMPLATE.split("{professor_name}", 1)
+_SUFFIX_HEADER, _SUFFIX_DATA = _SUFFIX_REST.split("{professor_name_upper}")
+_SUFFIX_DATA_OPEN, _SUFFIX_DATA_CLOSE = _SUFFIX_DATA.split("{compact_context}")
+
+# Batch prompting: several professors share one copy of the static instructions
+_BATCH_INSTRUCTION = """
+
+Batch: the sources below cover {count} professors. Write one complete CV per professor, in order. Start each CV with the marker line "### CV[n]" (n = the professor's number), followed by that professor's header line. Never mix data between professors."""
+
+# Short fingerprint of the static instructions; cached CVs keyed with it are
+# invalidated automatically whenever the template changes
+PROMPT_VERSION = hashlib.blake2b(
+    (_STATIC_PREFIX_STRUCTURED + _DYNAMIC_SUFFIX_TEMPLATE + _BATCH_INSTRUCTION).encode(), digest_size=8
+).hexdigest()
+
+def get_cv_generation_prompt(professor_name: str, compact_context: str, structured: bool = False) -> str:
     """
     Generate a CLEAR, DIRECT prompt for CV generation.
     Removes ALL confusion and complexity.
+    The static instructions (STATIC_PREFIX) come first and only the dynamic fields are
+    joined in after them. With structured=True the model is told to answer in JSON
+    (see cv_schema.CVModel).
     """
-    
-    return f"""You are an expert CV data extractor. Extract ALL information from these sources for {professor_name}:
-
-{compact_context}
-
-**CRITICAL EXTRACTION RULES:**
-
-🎯 **RULE 1: DATA SOURCE PRIORITY**
-- 🥇 ENG.UI.AC.ID official page (if available) = MOST AUTHORITATIVE
-- 🥈 UI SCHOLAR = Primary for publications
-- 🥉 GOOGLE SCHOLAR = Secondary for publications
-- 🔹 DATABASE = Fallback
-
-🎓 **RULE 2: EDUCATION** (LANGUAGE AGNOSTIC)
-Look for these patterns in ANY language (Indonesian OR English):
-- Degree words: "Bachelor", "Sarjana", "S.T.", "Master", "Magister", "M.T.", "Doctoral", "Doktor", "Ph.D.", "Dr.Eng"
-- University words: "University", "Universitas", "Institut"
-- Year: 19XX or 20XX
-
-Extract format: **[Degree]**, [University], [Country], [Year]
-
-Examples from sources:
-- "Bachelor, Universitas Indonesia, Indonesia, 2008"
-- "Master, Universitas Indonesia, Indonesia, 2011"
-- "Doctoral, University of Kitakyushu, Japan, 2018"
-
-📚 **RULE 3: PUBLICATIONS** (MOST CRITICAL - FIX THE BUG!)
-
-**STEP 1: Find publication data**
-Scan ALL sources for these patterns:
-- Lines with paper titles (usually > 30 characters)
-- Lines with years (2015-2025)
-- Lines with "Journal:", "Conference:", "Proceedings"
-- Author lists with multiple names
-
-**STEP 2: Extract COMPLETE data**
-For EACH publication you find, extract:
-✅ FULL paper title (the ACTUAL research paper name, NOT just "Source: ENG.UI.AC.ID")
-✅ All authors (comma-separated)
-✅ Year (YYYY format)
-✅ Venue (journal name OR conference name)
-
-**STEP 3: Validation**
-❌ REJECT if:
-- Only has "Source: ENG.UI.AC.ID" without paper title
-- Only has conference name like "Conference on Radar..." without paper title
-- Missing year or authors
-- Duplicate of already listed publication
-
-✅ ACCEPT if:
-- Has SPECIFIC paper title (e.g., "Benchmarking machine learning algorithm for stunting risk prediction in Indonesia")
-- Has author list
-- Has year
-- Has venue (journal/conference)
-
-**STEP 4: Format** (NON-NEGOTIABLE - MUST INCLUDE YEAR!)
-For each valid publication:
-
-**Journal:**
-- **[FULL PAPER TITLE]**
-  - Authors: [Author1, Author2, Author3, ...]
-  - Journal: [Journal Name]
-  - Year: [YYYY] 🚨 REQUIRED - DO NOT SKIP
-  - Source: [ENG.UI.AC.ID / UI Scholar / Google Scholar]
-
-**Conference:**
-- **[FULL PAPER TITLE]**
-  - Authors: [Author1, Author2, ...]
-  - Conference: [Conference Name with Location]
-  - Year: [YYYY] 🚨 REQUIRED - DO NOT SKIP
-  - Source: [ENG.UI.AC.ID / UI Scholar / Google Scholar]
-
-**EXAMPLES OF CORRECT EXTRACTION:**
-
-✅ GOOD (has all fields):
-- **Benchmarking machine learning algorithm for stunting risk prediction in Indonesia**
-  - Authors: N. Novalina, I. A. A. Tarigan, F. K. Kameela, M. Rizkinia
-  - Journal: Bulletin of Electrical Engineering and Informatics
-  - Year: 2025
-  - Source: ENG.UI.AC.ID
-
-✅ GOOD (has all fields):
-- **A CNN-RF Hybrid Approach for Rice Paddy Fields Mapping in Indramayu Using Sentinel-1 and Sentinel-2 Data**
-  - Authors: D. Sudiana, M. Rizkinia, et al.
-  - Journal: Computers
-  - Year: 2025
-  - Source: ENG.UI.AC.ID
-
-❌ BAD (incomplete - missing title):
-- Source: ENG.UI.AC.ID OFFICIAL PERSONNEL PAGE
-
-❌ BAD (incomplete - only conference name, no paper title):
-- Conference: International Conference on Radar, Antenna, Microwave...
-
-❌ BAD (incomplete - missing authors and year):
-- **Some Paper Title**
-  - Journal: IEEE
-  
-**TARGET:** Extract 10-15 complete publications (if data available)
-
----
-
-**OUTPUT FORMAT:**
-
-# DR. ENG. {professor_name.upper()}
-
-## PERSONAL INFORMATION
-- Position: [Extract from sources]
-- Affiliation: Universitas Indonesia
-- Department: Departemen Teknik Elektro
-- Email: [email@ui.ac.id with @ symbol]
-- H-Index: [if available]
-- Citations: [if available]
-
-## EDUCATION
-- **Doctoral**, [University], [Country], [Year]
-- **Master**, [University], [Country], [Year]
-- **Bachelor**, [University], [Country], [Year]
-
-## RESEARCH INTERESTS
-- [Interest 1]
-- [Interest 2]
-- [Interest 3]
-- [Interest 4]
-- [Interest 5]
-
-## SELECTED PUBLICATIONS
-
-🚨 **ABSOLUTE REQUIREMENTS - NON-NEGOTIABLE:**
-1. You MUST list AT LEAST 10 publications (target: 15)
-2. EVERY publication MUST include ALL 4 fields:
-   - **[Complete Paper Title]**
-   - Authors: [Full list]
-   - Journal/Conference: [Full name]
-   - Year: [YYYY] ← MANDATORY
-3. Do NOT skip publications from the sources above
-4. Do NOT write "Source: ENG.UI.AC.ID" without actual paper title
-5. Extract ALL publications visible in the data sources
-
-**NOW LIST 10-15 PUBLICATIONS BELOW:**
-
-1. **[First publication title]**
-   - Authors: [...]
-   - Journal/Conference: [...]
-   - Year: [YYYY]
-   - Source: [...]
-
-2. **[Second publication title]**
-   - Authors: [...]
-   - Journal/Conference: [...]
-   - Year: [YYYY]
-   - Source: [...]
-
-[Continue listing ALL publications from sources - minimum 10 required]
-
----
-
-**MANDATORY VALIDATION BEFORE SUBMISSION:**
-🛑 STOP if any publication is missing Year field
-🛑 STOP if any publication is just "Source: ENG.UI.AC.ID"
-🛑 STOP if fewer than 10 publications extracted
-✅ PROCEED only if ALL publications have 4 complete fields
-✅ Education section has 3 entries (Bachelor/Master/Doctoral)
-✅ Email uses @ symbol (not [at])
-
-NOW extract the CV with MINIMUM 10 complete publications including years:"""
\ No newline at end of file
+    return ''.join((
+        _STATIC_PREFIX_STRUCTURED if structured else STATIC_PREFIX,
+        _SUFFIX_NAME, professor_name,
+        _SUFFIX_HEADER, professor_name.upper(),
+        _SUFFIX_DATA_OPEN, compact_context, _SUFFIX_DATA_CLOSE
+    ))
+
+def get_cv_batch_prompt(professors: list) -> str:
+    """
+    One markdown CV prompt for several professors, given as (professor_name, compact_context)
+    pairs. The model answers with "### CV[n]" sections in the same order.
+    """
+    parts = [STATIC_PREFIX, _BATCH_INSTRUCTION.replace("{count}", str(len(professors)))]
+    for number, (professor_name, compact_context) in enumerate(professors, 1):
+        parts += [
+            f"\n\n## PROFESSOR [{number}]: {professor_name}\nHeader line: # DR. ENG. {professor_name.upper()}\n\n<data>\n",
+            compact_context,
+            "\n</data>"
+        ]
+    return ''.join(parts)
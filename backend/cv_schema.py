@@ -0,0 +1,137 @@
+"""
+Structured CV output schema
+Used when the LLM is asked for JSON (CV_STRUCTURED_OUTPUT / CV_MAP_REDUCE) instead of free-form
+markdown; per-source results are merged and the markdown the PDF generator expects is rendered
+deterministically in Python.
+"""
+
+import re
+from typing import Dict, List, Sequence
+from pydantic import BaseModel, Field
+
+
+class Education(BaseModel):
+    degree: str = Field(..., description="Bachelor, Master or Doctoral")
+    university: str
+    country: str = ""
+    year: str = Field("", description="YYYY")
+
+
+class Publication(BaseModel):
+    title: str = Field(..., description="Full paper title (not just the source name)")
+    authors: str = Field(..., description="Comma-separated author list")
+    venue_type: str = Field("Journal", description="Journal or Conference")
+    venue: str = Field(..., description="Journal or conference name")
+    year: str = Field(..., description="YYYY")
+    source: str = Field("", description="ENG.UI.AC.ID, UI Scholar or Google Scholar")
+
+
+class CVModel(BaseModel):
+    name: str = Field(..., description="Full name with academic titles")
+    position: str = ""
+    affiliation: str = "Universitas Indonesia"
+    department: str = "Departemen Teknik Elektro"
+    email: str = Field("", description="Email address with @ symbol")
+    h_index: str = ""
+    citations: str = ""
+    education: List[Education] = []
+    research_interests: List[str] = []
+    publications: List[Publication] = []
+
+
+def render_cv_markdown(cv: CVModel) -> str:
+    """Render a parsed CVModel in the markdown layout parse_markdown_cv() understands."""
+    lines = [f"# {cv.name}", "", "## PERSONAL INFORMATION"]
+    for label, value in (
+        ("Position", cv.position),
+        ("Affiliation", cv.affiliation),
+        ("Department", cv.department),
+        ("Email", cv.email),
+        ("H-Index", cv.h_index),
+        ("Citations", cv.citations),
+    ):
+        if value:
+            lines.append(f"- {label}: {value}")
+
+    if cv.education:
+        lines += ["", "## EDUCATION"]
+        for edu in cv.education:
+            details = ", ".join(part for part in (edu.university, edu.country, edu.year) if part)
+            lines.append(f"- **{edu.degree}**, {details}")
+
+    if cv.research_interests:
+        lines += ["", "## RESEARCH INTERESTS"]
+        lines += [f"- {interest}" for interest in cv.research_interests]
+
+    if cv.publications:
+        lines += ["", "## SELECTED PUBLICATIONS"]
+        for i, pub in enumerate(cv.publications, 1):
+            lines += [
+                "",
+                f"{i}. **{pub.title}**",
+                f"   - Authors: {pub.authors}",
+                f"   - {pub.venue_type or 'Journal'}: {pub.venue}",
+                f"   - Year: {pub.year}",
+            ]
+            if pub.source:
+                lines.append(f"   - Source: {pub.source}")
+
+    return "\n".join(lines)
+
+
+def _normalize_title(title: str) -> str:
+    return re.sub(r'[^a-z0-9]+', ' ', title.lower()).strip()
+
+
+def merge_cvs(
+    cvs: Dict[str, CVModel],
+    field_priority: Sequence[str],
+    publication_priority: Sequence[str],
+    max_publications: int = 15
+) -> CVModel:
+    """
+    Deterministically merge per-source CVs (keyed by source name) into one.
+    Scalar fields and education come from the first source in `field_priority`
+    that has them; publications are deduplicated by normalized title, taking
+    sources in `publication_priority` order.
+    """
+    by_field = [cvs[name] for name in field_priority if name in cvs]
+    by_publication = [cvs[name] for name in publication_priority if name in cvs]
+
+    merged = {}
+    for field_name in ('name', 'position', 'affiliation', 'department', 'email', 'h_index', 'citations'):
+        value = next((getattr(cv, field_name) for cv in by_field if getattr(cv, field_name)), None)
+        if value:
+            merged[field_name] = value
+
+    education, seen_degrees = [], set()
+    for cv in by_field:
+        for edu in cv.education:
+            degree = edu.degree.strip().lower()
+            if degree not in seen_degrees:
+                seen_degrees.add(degree)
+                education.append(edu)
+
+    interests, seen_interests = [], set()
+    for cv in by_field:
+        for interest in cv.research_interests:
+            key = interest.strip().lower()
+            if key and key not in seen_interests:
+                seen_interests.add(key)
+                interests.append(interest)
+
+    publications, seen_titles = [], set()
+    for cv in by_publication:
+        for pub in cv.publications:
+            key = _normalize_title(pub.title)
+            if key and key not in seen_titles:
+                seen_titles.add(key)
+                publications.append(pub)
+
+    return CVModel(
+        name=merged.pop('name', ''),
+        education=education,
+        research_interests=interests,
+        publications=publications[:max_publications],
+        **merged
+    )
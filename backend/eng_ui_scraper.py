@@ -4,10 +4,27 @@ Specialized scraper for Faculty of Engineering UI personnel pages
 """
 
 import requests
+from http_session import session as http_session
 from bs4 import BeautifulSoup
 import re
 from typing import Dict, Optional
 
+_TITLE_RE = re.compile(r'\b(dr\.?|eng\.?|st\.?|mt\.?|m\.eng\.?|ph\.?d\.?|prof\.?)\b', re.IGNORECASE)
+_NON_LETTER_RE = re.compile(r'[^a-z\s]')
+_TRAILING_YEAR_RE = re.compile(r'(\d{4})$')
+
+def normalize_professor_name(professor_name: str) -> str:
+    """
+    Bare lowercase name without titles/degrees ("Dr. Mia Rizkinia, S.T., M.T." → "mia rizkinia").
+    Used for the personnel URL and to key cached CVs, so title variants of one name match.
+    """
+    # Degrees after the name are comma-separated ("..., S.T., M.T."): keep only the name part
+    name_clean = professor_name.split(',')[0]
+    # Remove titles and degrees: Dr., Dr. Eng., S.T., M.T., M.Eng., Ph.D., etc.
+    name_clean = _TITLE_RE.sub('', name_clean)
+    # Convert to lowercase, remove non-letters and normalize spaces
+    return ' '.join(_NON_LETTER_RE.sub('', name_clean.lower()).split())
+
 def scrape_eng_ui_personnel(professor_name: str) -> Optional[Dict]:
     """
     Scrape personnel page from eng.ui.ac.id
@@ -20,15 +37,7 @@ def scrape_eng_ui_personnel(professor_name: str) -> Optional[Dict]:
     """
     
     # Normalize name for URL
-    # Remove titles and degrees: Dr., Dr. Eng., S.T., M.T., M.Eng., Ph.D., etc.
-    name_clean = re.sub(r'\b(dr\.?|eng\.?|st\.?|mt\.?|m\.eng\.?|ph\.?d\.?|prof\.?)\b', '', professor_name, flags=re.IGNORECASE)
-    name_clean = name_clean.strip()
-    
-    # Convert to lowercase and remove non-letters
-    name_normalized = name_clean.lower()
-    name_normalized = re.sub(r'[^a-z\s]', '', name_normalized)
-    name_normalized = re.sub(r'\s+', ' ', name_normalized).strip()  # Normalize spaces
-    name_normalized = '-'.join(name_normalized.split())  # Replace spaces with hyphens
+    name_normalized = '-'.join(normalize_professor_name(professor_name).split())  # Replace spaces with hyphens
     
     url = f"https://eng.ui.ac.id/personnel/{name_normalized}/"
     
@@ -39,7 +48,7 @@ def scrape_eng_ui_personnel(professor_name: str) -> Optional[Dict]:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_session.get(url, headers=headers, timeout=10)
         
         if response.status_code == 404:
             print(f"[ENG_UI_SCRAPER] ❌ Page not found (404): {url}")
@@ -49,7 +58,7 @@ def scrape_eng_ui_personnel(professor_name: str) -> Optional[Dict]:
             print(f"[ENG_UI_SCRAPER] ❌ HTTP {response.status_code}")
             return None
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         
         # Extract data
         data = {
@@ -98,7 +107,7 @@ def scrape_eng_ui_personnel(professor_name: str) -> Optional[Dict]:
                 for item in pub_list.find_all('li'):
                     pub_text = item.get_text(strip=True)
                     # Extract year from end (e.g., "...2025")
-                    year_match = re.search(r'(\d{4})$', pub_text)
+                    year_match = _TRAILING_YEAR_RE.search(pub_text)
                     year = year_match.group(1) if year_match else None
                     
                     # Remove year from title
@@ -0,0 +1,30 @@
+"""
+Shared HTTP session for the scraper and API tools
+Reuses keep-alive TCP/TLS connections per host instead of reconnecting on every request
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Pool per host (eng.ui.ac.id, scholar.ui.ac.id, serpapi.com, ...); sized for the
+# concurrent CV data collection and batch CV generation threads
+POOL_CONNECTIONS = 20
+POOL_MAXSIZE = 20
+
+# Only connection failures are retried here (the request never reached the server, so
+# it's always safe and costs no API quota). Read timeouts and 429/5xx responses go back
+# to the caller: the tools already have their own retry loops and status handling, and
+# retrying those here too would multiply attempts (and timeouts) on every call
+RETRY = Retry(
+    total=2,
+    connect=2,
+    read=0,
+    status=0,
+    backoff_factor=0.5,
+)
+
+session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=RETRY)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
@@ -1,6 +1,8 @@
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from astrapy import DataAPIClient
+from astrapy.exceptions import CollectionInsertManyException
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_community.document_loaders import WebBaseLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
@@ -33,6 +35,12 @@ academicData = [
     'https://sinta.kemdikbud.go.id/affiliations/detail?id=147&view=authors',  # UI Affiliations
 ]
 
+# Pages fetched concurrently (network-bound; embedding/insert still runs page by page)
+SCRAPE_WORKERS = 5
+
+# Chunks per embedding call when embedding a whole page at once fails
+EMBED_FALLBACK_BATCH_SIZE = 5
+
 # Initialize Astra DB client
 print("\n[1/5] Connecting to Astra DB...")
 client = DataAPIClient(ASTRA_DB_APPLICATION_TOKEN)
@@ -84,12 +92,14 @@ def scrape_page(url: str) -> str:
     try:
         print(f"  → Scraping: {url}")
         loader = WebBaseLoader([url])
-        docs = loader.load()
+        # One BeautifulSoup parse (the loader's own); script/style bodies are dropped
+        # instead of ending up in the embedded text
+        soup = loader.scrape()
+        for tag in soup(['script', 'style', 'noscript']):
+            tag.decompose()
+        raw_text = soup.get_text(separator=' ')
         
-        if docs:
-            # Clean HTML and extract text
-            import re
-            raw_text = re.sub(r'<[^>]*>', '', docs[0].page_content)
+        if raw_text.strip():
             # Remove excessive whitespace
             cleaned_text = ' '.join(raw_text.split())
             print(f"    ✓ Scraped {len(cleaned_text)} characters")
@@ -101,16 +111,52 @@ def scrape_page(url: str) -> str:
         print(f"    ✗ Error: {str(e)}")
         return None
 
+# Function to embed a page's chunks
+def embed_chunks(chunks: list) -> list:
+    """
+    Embed all chunks of a page in one call (the embeddings client batches up to 100 texts
+    per request). If that fails (e.g. quota exhausted), retry in small batches with a pause
+    between them. Returns (chunk_index, chunk, vector) tuples for the chunks that got embedded.
+    """
+    try:
+        print(f"    → Embedding {len(chunks)} chunks...")
+        return list(zip(range(1, len(chunks) + 1), chunks, embeddings.embed_documents(chunks)))
+    except Exception as e:
+        print(f"    ⚠ Embedding all chunks failed: {str(e)}")
+        print(f"    → Retrying in batches of {EMBED_FALLBACK_BATCH_SIZE}...")
+    
+    embedded = []
+    for i in range(0, len(chunks), EMBED_FALLBACK_BATCH_SIZE):
+        batch = chunks[i:i+EMBED_FALLBACK_BATCH_SIZE]
+        
+        try:
+            print(f"    → Processing chunks {i+1}-{min(i+EMBED_FALLBACK_BATCH_SIZE, len(chunks))}...")
+            embedding_results = embeddings.embed_documents(batch)
+            embedded.extend(zip(range(i+1, i+len(batch)+1), batch, embedding_results))
+            
+            # Add delay to avoid rate limits (1 second between batches)
+            if i + EMBED_FALLBACK_BATCH_SIZE < len(chunks):
+                time.sleep(1)
+                
+        except Exception as e:
+            print(f"    ✗ Error processing batch: {str(e)}")
+            print(f"    ⚠ Waiting 5 seconds before continuing...")
+            time.sleep(5)
+            continue
+    return embedded
+
 # Load and process academic data
 print("\n[4/5] Scraping and loading academic profile data...")
 print("-" * 60)
 
+# Fetch every page up front in parallel so the network waits overlap
+with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as executor:
+    page_contents = list(executor.map(scrape_page, academicData))
+
 total_chunks = 0
-for idx, url in enumerate(academicData, 1):
+for idx, (url, content) in enumerate(zip(academicData, page_contents), 1):
     print(f"\n[{idx}/{len(academicData)}] Processing: {url}")
     
-    content = scrape_page(url)
-    
     if not content:
         print(f"  ⚠ Skipping {url} - no content")
         continue
@@ -119,47 +165,28 @@ for idx, url in enumerate(academicData, 1):
     chunks = splitter.split_text(content)
     print(f"  → Split into {len(chunks)} chunks")
     
-    # Generate embeddings in batches to avoid rate limits
-    batch_size = 5
-    for i in range(0, len(chunks), batch_size):
-        batch = chunks[i:i+batch_size]
-        
+    # Bulk insert the page into Astra DB (unordered: one bad chunk doesn't stop the rest)
+    docs = [
+        {
+            "$vector": vector,
+            "text": chunk,
+            "source_url": url,
+            "chunk_index": chunk_idx
+        }
+        for chunk_idx, chunk, vector in embed_chunks(chunks)
+    ]
+    if docs:
         try:
-            # Generate embeddings for batch
-            print(f"    → Processing chunks {i+1}-{min(i+batch_size, len(chunks))}...")
-            embedding_results = embeddings.embed_documents(batch)
-            
-            # Insert batch into Astra DB
-            for chunk_idx, (chunk, vector) in enumerate(zip(batch, embedding_results), start=i+1):
-                try:
-                    collection.insert_one({
-                        "$vector": vector,
-                        "text": chunk,
-                        "source_url": url,
-                        "chunk_index": chunk_idx
-                    })
-                    total_chunks += 1
-                except Exception as e:
-                    print(f"      ✗ Error inserting chunk {chunk_idx}: {str(e)}")
-                    continue
-            
-            # Add delay to avoid rate limits (1 second between batches)
-            if i + batch_size < len(chunks):
-                time.sleep(1)
-                
+            result = collection.insert_many(docs, ordered=False)
+            total_chunks += len(result.inserted_ids)
+        except CollectionInsertManyException as e:
+            total_chunks += len(e.inserted_ids)
+            print(f"    ✗ Inserted {len(e.inserted_ids)}/{len(docs)} chunks: {str(e)}")
         except Exception as e:
-            print(f"    ✗ Error processing batch: {str(e)}")
-            print(f"    ⚠ Waiting 5 seconds before continuing...")
-            time.sleep(5)
-            continue
+            print(f"    ✗ Error inserting chunks: {str(e)}")
     
     print(f"  ✓ Completed processing {url}")
     print(f"    → Total chunks inserted from this source: {total_chunks}")
-    
-    # Add delay between sources
-    if idx < len(academicData):
-        print(f"  ⏳ Waiting 3 seconds before next source...")
-        time.sleep(3)
 
 # Summary
 print("\n" + "=" * 60)
@@ -0,0 +1,34 @@
+"""
+Shared logging setup for the backend modules
+Each module logger writes through a QueueHandler so request/generation threads only enqueue
+records; formatting and stdout writes happen on a QueueListener background thread.
+"""
+
+import os
+import atexit
+import logging
+import logging.handlers
+import queue
+
+
+def configure(name: str) -> logging.Logger:
+    """
+    Return the `name` logger, attaching the queue handler + listener on first call.
+    Level comes from LOG_LEVEL (default INFO, so per-step debug logs cost nothing).
+    """
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
+
+    listener.start()
+    atexit.register(listener.stop)
+    return logger
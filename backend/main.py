@@ -8,6 +8,7 @@ from starlette.responses import StreamingResponse, Response
 from crewai import LLM
 import io
 import os
+import json
 from dotenv import load_dotenv
 from pdf_generator import create_cv_pdf  # Import CV generator
 from datetime import datetime
@@ -36,6 +37,7 @@ class CVGenerationRequest(BaseModel):
     professor_name: str
     session_id: Optional[str] = None
     use_crewai: bool = True
+    force_refresh: bool = False  # Bypass cached tool outputs / CVs
 
 # --- Konfigurasi CORS (DIPERBAIKI) ---
 origins = [
@@ -302,11 +304,13 @@ async def generate_cv(request: CVGenerationRequest):
             print("[CV API]   Agent 2: Data Analyzer (extracts structured info)")
             print("[CV API]   Agent 3: CV Composer (formats professional CV)")
             
-            from cv_agent import generate_cv_with_agents
+            from cv_agent import simplified_cv_generation_async
             
-            cv_result = generate_cv_with_agents(
+            # Awaited in a worker thread: a 10-30s generation must not block the event loop
+            cv_result = await simplified_cv_generation_async(
                 professor_name=request.professor_name,
-                session_id=request.session_id
+                session_id=request.session_id,
+                force_refresh=request.force_refresh
             )
             
             if not cv_result["success"]:
@@ -371,6 +375,32 @@ async def generate_cv(request: CVGenerationRequest):
             }
         )
 
+@app.post("/api/generate-cv/stream")
+async def generate_cv_stream(request: CVGenerationRequest):
+    """
+    Stream the CV markdown as Server-Sent Events while the LLM generates it.
+    Each event carries a JSON-encoded chunk of text; a final "done" event closes the stream.
+    A "reset" event means the LLM failed midway: discard the text so far, the fallback CV follows.
+    """
+    from cv_agent import simplified_cv_generation_stream, STREAM_RESET
+    
+    print(f"[CV API] 📡 STREAMING CV GENERATION for: {request.professor_name}")
+    
+    def event_stream():
+        try:
+            for chunk in simplified_cv_generation_stream(request.professor_name, force_refresh=request.force_refresh):
+                if chunk is STREAM_RESET:
+                    # Generation failed midway: the client drops the partial CV, the fallback follows
+                    yield "event: reset\ndata: {}\n\n"
+                    continue
+                yield f"data: {json.dumps({'text': chunk})}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            print(f"\n[ERROR] CV streaming failed: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 @app.post("/api/generate-pdf")
 async def generate_pdf(request: QueryRequest):
     """
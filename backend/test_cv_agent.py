@@ -0,0 +1,234 @@
+"""
+Unit tests for cv_agent's text helpers (LLM and cache calls are monkeypatched; no network or database access)
+Run from backend/: python -m pytest test_cv_agent.py
+"""
+
+import pytest
+
+import cv_agent
+
+
+def _cv(publication_count: int, numbered_education: bool = True) -> str:
+    """A CV in the CV_TEMPLATE layout with `publication_count` entries."""
+    parts = ["# DR. ENG. MIA RIZKINIA", "", "## EDUCATION"]
+    if numbered_education:
+        parts += ["1. **Bachelor**, Universitas Indonesia", "2. **Master**, Universitas Indonesia", "3. **Doctoral**, Universitas Indonesia"]
+    parts += ["", "## SELECTED PUBLICATIONS"]
+    for i in range(1, publication_count + 1):
+        parts += ["", f"{i}. **Paper Title {i}**", "   - Authors: M. Rizkinia", "   - Journal: IEEE Access", "   - Year: 2021"]
+    parts += ["", "## RESEARCH INTERESTS", "1. **Remote sensing**"]
+    return "\n".join(parts)
+
+
+def test_count_publications_counts_numbered_entries_in_section_only():
+    assert cv_agent._count_publications(_cv(15)) == 15
+
+
+def test_count_publications_well_formed_cv_passes_escalation_gate():
+    assert cv_agent._count_publications(_cv(cv_agent.CV_MIN_PUBLICATIONS)) >= cv_agent.CV_MIN_PUBLICATIONS
+
+
+def test_count_publications_without_section_is_zero():
+    assert cv_agent._count_publications("# NAME\n\n## EDUCATION\n1. **Bachelor**") == 0
+
+
+def test_count_publications_matches_template_fill():
+    label = next(iter(cv_agent._SOURCE_LABELS))
+    publications = [{"title": f"Paper {i}", "year": "2020", "source": label} for i in range(12)]
+    cv_text = cv_agent._build_template_cv("Mia Rizkinia", {"name": "Mia Rizkinia"}, publications)
+    assert cv_agent._count_publications(cv_text) == 12
+
+
+def test_extract_key_info_matches_plural_research_areas():
+    text = "Research: Computer Networks, IoT systems and Protocol Engineering; computer network security"
+    assert cv_agent.extract_key_info(text)["research_areas"] == ["Computer Network", "IoT", "Protocol Engineering"]
+
+
+def test_extract_key_info_ignores_research_keywords_inside_words():
+    assert cv_agent.extract_key_info("Riot control and Computer Networking")["research_areas"] == []
+
+
+def test_template_header_uses_titled_match_or_requested_name():
+    publications = [{"title": "Paper", "year": "2020", "source": next(iter(cv_agent._SOURCE_LABELS))}]
+    titled = cv_agent._build_template_cv("Mia Rizkinia", {"name": "Dr. Mia Rizkinia"}, publications)
+    generic = cv_agent._build_template_cv("Mia Rizkinia", {"name": "Teknik Elektro"}, publications)
+    other = cv_agent._build_template_cv("Mia Rizkinia", {"name": "Prof. Dr. Budi Santoso"}, publications)
+    
+    assert titled.startswith("# Dr. Mia Rizkinia\n")
+    assert generic.startswith("# Mia Rizkinia\n")
+    assert other.startswith("# Mia Rizkinia\n")
+
+
+def test_split_batch_cvs_in_order():
+    response = "Here are the CVs.\n### CV[1]\n# DR. A\n### CV[2]\n# DR. B\n"
+    assert cv_agent._split_batch_cvs(response, 2) == {0: "# DR. A", 1: "# DR. B"}
+
+
+def test_split_batch_cvs_reordered_sections_keep_their_numbers():
+    response = "### CV[2]\n# DR. B\n### CV[1]\n# DR. A"
+    assert cv_agent._split_batch_cvs(response, 2) == {0: "# DR. A", 1: "# DR. B"}
+
+
+def test_split_batch_cvs_missing_section_is_absent():
+    assert cv_agent._split_batch_cvs("### CV[1]\n# DR. A", 3) == {0: "# DR. A"}
+
+
+def test_split_batch_cvs_ignores_extra_and_repeated_sections():
+    response = "### CV[1]\n# DR. A\n### CV[4]\n# DR. EXTRA\n### CV[1]\n# DR. A AGAIN\n### CV[0]\n# DR. ZERO"
+    assert cv_agent._split_batch_cvs(response, 2) == {0: "# DR. A"}
+
+
+def test_split_batch_cvs_without_markers_is_empty():
+    assert cv_agent._split_batch_cvs("# DR. A\n## SELECTED PUBLICATIONS", 1) == {}
+
+
+class _Collected:
+    def sources_used(self):
+        return ["ui_scholar"]
+
+
+def test_generate_cv_batch_rejects_truncated_section(monkeypatch):
+    complete, truncated = _cv(cv_agent.CV_MIN_PUBLICATIONS), _cv(2)
+    cached = {}
+    monkeypatch.setattr(cv_agent, "_build_compact_context", lambda name, data: "context")
+    monkeypatch.setattr(cv_agent, "_call_llm", lambda prompt, **kw: f"### CV[1]\n{complete}\n### CV[2]\n{truncated}")
+    monkeypatch.setattr(cv_agent, "_cv_result_cache_key", lambda name, mode=None: f"{mode}:{name}")
+    monkeypatch.setattr(cv_agent.cv_cache, "cache_set", lambda key, value, ttl=None: cached.__setitem__(key, value))
+    
+    results = cv_agent._generate_cv_batch(["A", "B"], {"A": _Collected(), "B": _Collected()})
+    
+    assert list(results) == ["A"]
+    assert list(cached) == ["markdown:A"]
+
+
+def test_reduced_context_retry_only_for_timeouts_overloads_and_context_errors():
+    Timeout = type("Timeout", (Exception,), {})
+    ContextWindowExceededError = type("ContextWindowExceededError", (Exception,), {})
+    AuthenticationError = type("AuthenticationError", (Exception,), {})
+    
+    assert cv_agent._is_retryable_llm_error(Timeout("read timed out"))
+    assert cv_agent._is_retryable_llm_error(ContextWindowExceededError("too long"))
+    assert cv_agent._is_retryable_llm_error(TimeoutError("CV generation deadline exceeded"))
+    assert cv_agent._is_retryable_llm_error(Exception("The model is overloaded"))
+    assert not cv_agent._is_retryable_llm_error(AuthenticationError("invalid API key"))
+    assert not cv_agent._is_retryable_llm_error(ValueError("LLM returned insufficient content"))
+
+
+def test_stream_resets_and_falls_back_when_llm_fails_midway(monkeypatch):
+    class Collected(_Collected):
+        def has_source_data(self):
+            return True
+    
+    def failing_stream(prompt, deadline=None, **overrides):
+        yield "# DR. ENG. A\n"
+        raise RuntimeError("connection dropped")
+    
+    monkeypatch.setattr(cv_agent, "_cached_cv_result", lambda name, force_refresh=False: None)
+    monkeypatch.setattr(cv_agent, "_prepare_cv_prompt", lambda name, force_refresh=False: (Collected(), "prompt"))
+    monkeypatch.setattr(cv_agent, "_template_cv_result", lambda name, data: None)
+    monkeypatch.setattr(cv_agent.cv_cache, "cache_get", lambda key: None)
+    monkeypatch.setattr(cv_agent, "_stream_cv_markdown", failing_stream)
+    monkeypatch.setattr(cv_agent, "_fallback_cv_text", lambda name, data: "FALLBACK CV")
+    
+    chunks = list(cv_agent.simplified_cv_generation_stream("A"))
+    
+    assert chunks == ["# DR. ENG. A\n", cv_agent.STREAM_RESET, "FALLBACK CV"]
+
+
+def test_stream_cv_markdown_keeps_rules_inside_publications(monkeypatch):
+    deltas = ["## SELECTED PUBLICATIONS\n1. **A**\n", "---\n2. **B**\n   - Email: a [at] ", "ui.ac.id"]
+    monkeypatch.setattr(cv_agent, "_stream_llm", lambda prompt, deadline=None, **kw: iter(deltas))
+    
+    text = "".join(cv_agent._stream_cv_markdown("prompt"))
+    
+    assert text == "## SELECTED PUBLICATIONS\n1. **A**\n---\n2. **B**\n   - Email: a@ui.ac.id"
+
+
+def test_boilerplate_penalty_only_for_site_chrome():
+    assert cv_agent._line_score("Home | Login | Search", "") < 0
+    assert cv_agent._line_score("© 2024 Universitas Indonesia. All rights reserved.", "") < 0
+    assert cv_agent._line_score("This site uses cookies to improve your experience", "") < 0
+    assert cv_agent._line_score("Search-based test generation for IoT firmware", "") == 0
+    assert cv_agent._line_score("Home energy management with deep reinforcement learning", "") == 0
+
+
+def test_select_lines_keeps_publication_entry_together():
+    entry = "1. Hyperspectral unmixing with graph regularization\n   Authors: M. Rizkinia, M. Okuda\n   Year: 2019"
+    text = "\n".join([
+        "Home | Login | Search",
+        "Welcome to the faculty portal of the Department of Electrical Engineering",
+        entry,
+        "2. Another paper without any metadata lines listed here at all",
+    ])
+    
+    selected = cv_agent._select_lines(text, len(entry) + 1, "rizkinia")
+    
+    assert selected == entry
+
+
+def test_select_lines_preserves_document_order():
+    text = "Year: 2020\nHome\n1. First paper title\n   Year: 2018\nmenu text"
+    selected = cv_agent._select_lines(text, len("Year: 2020\n1. First paper title\n   Year: 2018\n"), "")
+    assert selected == "Year: 2020\n1. First paper title\n   Year: 2018"
+
+
+def test_dedupe_source_lines_drops_lines_already_in_higher_priority_source():
+    shared = "Hyperspectral image denoising using low rank tensor decomposition methods"
+    data = cv_agent.CollectedData(
+        ui_scholar=f"1. {shared}\n   Authors: M. Rizkinia, M. Okuda",
+        scholar=f"{shared}\n   Authors: M. Rizkinia, M. Okuda\nA completely different paper about smart grid optimization methods",
+    )
+    
+    cv_agent._dedupe_source_lines(data)
+    
+    assert shared not in data.scholar
+    assert "Authors: M. Rizkinia, M. Okuda" in data.scholar  # author lines are always kept
+    assert "smart grid optimization" in data.scholar
+    assert shared in data.ui_scholar
+
+
+def test_dedupe_source_lines_keeps_repeats_within_one_source_and_short_lines():
+    line = "Remote sensing image classification with convolutional neural networks"
+    data = cv_agent.CollectedData(
+        ui_scholar=f"{line}\n{line}\nYear: 2021",
+        scholar="Year: 2021",
+    )
+    
+    cv_agent._dedupe_source_lines(data)
+    
+    assert data.ui_scholar == f"{line}\n{line}\nYear: 2021"
+    assert data.scholar == "Year: 2021"
+
+
+def test_batch_falls_back_per_professor_without_rerunning_collection(monkeypatch):
+    def collect(name, force_refresh=False):
+        if name == "Broken":
+            raise ConnectionError("scholar.ui.ac.id unreachable")
+        return cv_agent.CollectedData(raw_info={"name": name})  # no source text
+    
+    monkeypatch.setattr(cv_agent, "_cached_cv_result", lambda name, force_refresh=False: None)
+    monkeypatch.setattr(cv_agent, "_collect_cv_data", collect)
+    monkeypatch.setattr(cv_agent, "simplified_cv_generation", lambda name: pytest.fail("collected twice"))
+    
+    results = cv_agent.simplified_cv_generation_batch(["Empty", "Broken"])
+    
+    assert [r["professor_name"] for r in results] == ["Empty", "Broken"]
+    assert all(r["metadata"]["generated_by"] == "Fallback Generator (no source data)" for r in results)
+    assert "unreachable" in results[1]["metadata"]["warning"]
+
+
+def test_stream_replaces_too_short_cv_with_fallback(monkeypatch):
+    class Collected(_Collected):
+        def has_source_data(self):
+            return True
+    
+    monkeypatch.setattr(cv_agent, "_cached_cv_result", lambda name, force_refresh=False: None)
+    monkeypatch.setattr(cv_agent, "_prepare_cv_prompt", lambda name, force_refresh=False: (Collected(), "prompt"))
+    monkeypatch.setattr(cv_agent, "_template_cv_result", lambda name, data: None)
+    monkeypatch.setattr(cv_agent.cv_cache, "cache_get", lambda key: None)
+    monkeypatch.setattr(cv_agent, "_stream_cv_markdown", lambda prompt, deadline=None, **kw: iter(["# DR. ENG. A\n"]))
+    monkeypatch.setattr(cv_agent, "_fallback_cv_text", lambda name, data: "FALLBACK CV")
+    
+    chunks = list(cv_agent.simplified_cv_generation_stream("A"))
+    
+    assert chunks == ["# DR. ENG. A\n", cv_agent.STREAM_RESET, "FALLBACK CV"]
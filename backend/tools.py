@@ -9,6 +9,7 @@ from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
 import requests
+from http_session import session as http_session  # Shared keep-alive connection pool
 from bs4 import BeautifulSoup
 import sinta  # Fixed: was 'import sinta_scraper'
 
@@ -64,7 +65,7 @@ class TavilySearchTool(BaseTool):
                 "max_results": 5
             }
             
-            response = requests.post(url, json=payload, timeout=30)
+            response = http_session.post(url, json=payload, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -251,7 +252,7 @@ class DynamicWebScraperTool(BaseTool):
                 }
                 
                 print(f"[UI_SCRAPER] Attempt {attempt}/{max_retries}: Sending HTTP request (timeout={timeout}s)...")
-                response = requests.get(url, headers=headers, timeout=timeout)
+                response = http_session.get(url, headers=headers, timeout=timeout)
                 response.raise_for_status()
                 print(f"[UI_SCRAPER] HTTP {response.status_code} - Content length: {len(response.content)}")
                 
@@ -425,7 +426,7 @@ class GoogleScholarSearchTool(BaseTool):
                 "num": 5  # Top 5 results
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_session.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -490,7 +491,7 @@ class GoogleScholarProfilesSearchTool(BaseTool):
                 "hl": "en"
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = http_session.get(url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -559,7 +560,7 @@ class GoogleScholarAuthorProfileTool(BaseTool):
                 "num": 100  # Get up to 100 publications
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = http_session.get(url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -656,7 +657,7 @@ class GoogleScholarPublicationsSearchTool(BaseTool):
                 "num": 20  # Get 20 results
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = http_session.get(url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -745,7 +746,7 @@ class GoogleScholarCitedByTool(BaseTool):
                 "num": 20
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = http_session.get(url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -970,7 +971,7 @@ class UIScholarSearchTool(BaseTool):
             }
             
             print(f"[UI_SCHOLAR] Fetching: {url}")
-            response = requests.get(url, headers=headers, timeout=20)
+            response = http_session.get(url, headers=headers, timeout=20)
             
             if response.status_code == 404:
                 print(f"[UI_SCHOLAR] ✗ Person page not found (404)")